@@ -2,7 +2,11 @@ import pytest
 import tempfile
 import os
 import json
-from solution import ConfigurationProcessor, ConfigurationError
+import pickle
+from solution import (
+    ConfigurationProcessor, ConfigurationError, ConfigView, ConfigHolder, IndexedConfig, LazyConfigView,
+    ResultCacheInfo, StageEvent, StageStats, StreamStats, ValidationIssue, main,
+)
 
 
 @pytest.fixture
@@ -682,3 +686,961 @@ def test_transform_any_to_string_coercion():
     assert result["description"] == "45.67"
     assert result["title"] == "True"
     assert result["label"] == "['a', 'b']"
+
+
+def test_compiled_plan_wide_schema_error_order():
+    schema = {f"field_{i}": {"type": "integer", "min_value": 0, "max_value": 10} for i in range(50)}
+    processor = ConfigurationProcessor(schema)
+    config = {f"field_{i}": (i if i % 2 else -i - 1) for i in range(50)}
+    config["field_7"] = "seven"
+
+    is_valid, errors = processor.validate_configuration(config)
+    assert is_valid == False
+    assert errors[0] == "Field 'field_0' value -1 is below minimum 0"
+    assert "Field 'field_7' must be integer, got str" in errors
+    assert "Field 'field_11' value 11 is above maximum 10" in errors
+    assert len(errors) == 46
+
+
+def test_compiled_plan_deep_schema_paths():
+    schema = {"leaf": {"type": "string", "required": True, "allowed_values": ["x"]}}
+    for level in range(5, 0, -1):
+        schema = {f"l{level}": {"type": "dict", "required": True, "nested_schema": schema}}
+    processor = ConfigurationProcessor(schema)
+
+    is_valid, errors = processor.validate_configuration({"l1": {"l2": {"l3": {"l4": {"l5": {}}}}}})
+    assert is_valid == False
+    assert errors == ["Required field 'l1.l2.l3.l4.l5.leaf' is missing"]
+
+    is_valid, errors = processor.validate_configuration({"l1": {"l2": {"l3": {"l4": {"l5": {"leaf": "y"}}}}}})
+    assert errors == ["Field 'l1.l2.l3.l4.l5.leaf' value 'y' not in allowed values ['x']"]
+
+
+def test_compiled_plan_reused_across_validations(schema):
+    processor = ConfigurationProcessor(schema)
+    bad = {"database": {"host": "localhost", "port": 0}}
+    good = {"database": {"host": "localhost", "port": 1}}
+
+    assert processor.validate_configuration(bad) == (False, ["Field 'database.port' value 0 is below minimum 1"])
+    assert processor.validate_configuration(good) == (True, [])
+    assert processor.validate_configuration(bad) == (False, ["Field 'database.port' value 0 is below minimum 1"])
+
+
+def test_compiled_plan_unknown_type_skips_type_check():
+    schema = {"anything": {"type": "number", "min_value": 5, "allowed_values": [1, 10]}}
+    processor = ConfigurationProcessor(schema)
+
+    is_valid, errors = processor.validate_configuration({"anything": 1})
+    assert errors == ["Field 'anything' value 1 is below minimum 5"]
+    is_valid, errors = processor.validate_configuration({"anything": "text"})
+    assert errors == ["Field 'anything' value 'text' not in allowed values [1, 10]"]
+
+
+@pytest.mark.parametrize("config", [
+    {"database": {"host": "localhost", "port": 5432, "username": "admin"}, "debug": True, "log_level": "DEBUG", "timeout": 10.5, "features": ["auth"]},
+    {"debug": 123, "log_level": "INVALID_LEVEL", "timeout": 100.0, "features": []},
+    {"database": {"host": 1, "port": 0, "username": "ab"}, "timeout": "slow", "name": None},
+    {"database": {"port": 70000, "username": "x" * 30}, "features": "none", "log_level": ["DEBUG"]},
+    {"database": "not_a_dict", "debug": "true", "timeout": 0.05},
+    {},
+])
+def test_codegen_matches_interpreter(schema, config):
+    interpreted = ConfigurationProcessor(schema)
+    generated = ConfigurationProcessor(schema, codegen=True)
+    assert generated.validate_configuration(config) == interpreted.validate_configuration(config)
+
+
+def test_codegen_process_all_error_message(schema, temp_dir):
+    processor = ConfigurationProcessor(schema, codegen=True)
+    json_path = create_temp_file(temp_dir, "bad.json", '{"database": {"host": "db", "port": "0"}, "timeout": 50}')
+    processor.load_config_file(json_path, "json")
+
+    with pytest.raises(ConfigurationError) as exc_info:
+        processor.process_all()
+    assert str(exc_info.value) == (
+        "Configuration validation failed: Field 'database.port' value 0 is below minimum 1; "
+        "Field 'timeout' value 50 is above maximum 30.0"
+    )
+
+
+def test_codegen_deeply_nested_schema():
+    schema = {"leaf": {"type": "integer", "required": True, "max_value": 5}}
+    config = {"leaf": 9}
+    for level in range(40, 0, -1):
+        schema = {f"l{level}": {"type": "dict", "required": True, "nested_schema": schema}}
+        config = {f"l{level}": config}
+    path = ".".join(f"l{level}" for level in range(1, 41))
+
+    first = ConfigurationProcessor(schema, codegen=True)
+    second = ConfigurationProcessor(schema, codegen=True)
+    assert first.validate_configuration(config) == (False, [f"Field '{path}.leaf' value 9 is above maximum 5"])
+    assert second.validate_configuration({"l1": {}}) == (False, ["Required field 'l1.l2' is missing"])
+
+
+def test_process_all_matches_staged_pipeline(schema):
+    processor = ConfigurationProcessor(schema)
+    processor.configurations = [
+        {"database": {"host": " db ", "port": "5432"}, "extra": {"a": 1, "b": {"c": 2}}, "features": ["x"]},
+        {"database": {"username": 12345}, "extra": {"b": {"d": 3}}, "log_level": "warning"},
+        {"extra": {"a": [1, 2]}, "name": "  svc  ", "timeout": "2.5"},
+    ]
+
+    staged = processor.transform_values(processor.merge_configurations())
+    result = processor.process_all()
+    assert result == staged
+    assert list(result) == list(staged)
+    assert list(result["database"]) == list(staged["database"])
+    assert result["extra"] == {"a": [1, 2], "b": {"c": 2, "d": 3}}
+    assert result["database"]["username"] == "12345"
+
+
+def test_process_all_scalar_overrides_nested_dict():
+    schema = {"app": {"type": "dict", "nested_schema": {"port": {"type": "integer", "default": 80}}}}
+    processor = ConfigurationProcessor(schema)
+    processor.configurations = [{"app": {"port": "81"}}, {"app": "disabled"}, {"other": 1}]
+
+    with pytest.raises(ConfigurationError) as exc_info:
+        processor.process_all()
+    assert str(exc_info.value) == "Configuration validation failed: Field 'app' must be dict, got str"
+
+    processor.configurations.append({"app": {"name": "x"}})
+    assert processor.process_all() == {"app": {"port": 80, "name": "x"}, "other": 1}
+
+
+def test_process_all_error_order_parent_before_nested():
+    schema = {
+        "svc": {
+            "type": "dict",
+            "allowed_values": [{"mode": "ON"}],
+            "nested_schema": {
+                "mode": {"type": "string", "transform": "uppercase", "allowed_values": ["ON", "OFF"]},
+                "port": {"type": "integer", "default": 0, "min_value": 1},
+            },
+        },
+        "after": {"type": "string", "required": True},
+    }
+    processor = ConfigurationProcessor(schema)
+    processor.configurations = [{"svc": {"mode": "maybe"}}]
+
+    with pytest.raises(ConfigurationError) as exc_info:
+        processor.process_all()
+    assert str(exc_info.value) == (
+        "Configuration validation failed: "
+        "Field 'svc' value '{'mode': 'MAYBE', 'port': 0}' not in allowed values [{'mode': 'ON'}]; "
+        "Field 'svc.mode' value 'MAYBE' not in allowed values ['ON', 'OFF']; "
+        "Field 'svc.port' value 0 is below minimum 1; "
+        "Required field 'after' is missing"
+    )
+
+
+def test_merge_configurations_matches_sequential_deep_merge():
+    processor = ConfigurationProcessor({})
+    processor.configurations = [
+        {"a": {"x": 1, "y": {"z": 1}}, "b": [1, 2], "c": {"keep": True}},
+        {"a": {"y": {"w": 2}}, "b": {"now": "dict"}, "d": 4},
+        {"a": {"x": {"deep": 1}}, "b": {"more": 1}, "d": {"e": 5}},
+        {"a": {"y": 3}},
+    ]
+
+    result = processor.merge_configurations()
+    assert result == {
+        "a": {"x": {"deep": 1}, "y": 3},
+        "b": {"now": "dict", "more": 1},
+        "c": {"keep": True},
+        "d": {"e": 5},
+    }
+    assert list(result) == ["a", "b", "c", "d"]
+
+
+def test_merge_configurations_shares_untouched_subtrees():
+    base = {"untouched": {"big": list(range(5))}, "shared": {"x": 1}}
+    overlay = {"shared": {"y": 2}, "only_overlay": {"z": 3}}
+    processor = ConfigurationProcessor({})
+    processor.configurations = [base, overlay]
+
+    result = processor.merge_configurations()
+    assert result["untouched"] is base["untouched"]
+    assert result["only_overlay"] is overlay["only_overlay"]
+    assert result["shared"] == {"x": 1, "y": 2}
+    assert result["shared"] is not base["shared"]
+    assert base["shared"] == {"x": 1}
+
+
+def test_merge_configurations_readonly_view():
+    processor = ConfigurationProcessor({})
+    processor.configurations = [{"db": {"hosts": ["a", "b"], "port": 1}}, {"db": {"port": 2}}]
+
+    view = processor.merge_configurations(readonly=True)
+    assert isinstance(view, ConfigView)
+    assert view == {"db": {"hosts": ["a", "b"], "port": 2}}
+    assert view["db"]["hosts"][1] == "b"
+    assert view["db"]["hosts"] == ["a", "b"]
+    with pytest.raises(TypeError):
+        view["db"]["port"] = 3
+    with pytest.raises(TypeError):
+        view["db"]["hosts"][0] = "c"
+    with pytest.raises(AttributeError):
+        view["db"]["hosts"].append("c")
+
+    copy = view.to_dict()
+    copy["db"]["hosts"].append("c")
+    assert processor.configurations[0]["db"]["hosts"] == ["a", "b"]
+
+
+def test_reload_reprocesses_changed_file(temp_dir, schema):
+    base = create_temp_file(temp_dir, "base.json", json.dumps({
+        "database": {"host": "db", "username": "admin"}, "log_level": "info", "features": ["a"],
+    }))
+    overlay = create_temp_file(temp_dir, "overlay.json", json.dumps({"database": {"port": "6000"}, "debug": "yes"}))
+    processor = ConfigurationProcessor(schema)
+    assert processor.load_config_file(base, "json")
+    assert processor.load_config_file(overlay, "json")
+
+    config, changed = processor.reload()
+    assert config == processor.process_all()
+    assert changed == {"database", "log_level", "features", "debug"}
+
+    create_temp_file(temp_dir, "overlay.json", json.dumps({"database": {"port": "7000"}, "debug": "yes"}))
+    config, changed = processor.reload()
+    assert changed == {"database.port"}
+    assert config["database"] == {"host": "db", "port": 7000, "username": "admin"}
+    assert config == processor.process_all()
+
+    config, changed = processor.reload()
+    assert changed == set()
+    with pytest.raises(TypeError):
+        config["database"]["port"] = 1
+
+
+def test_reload_ignores_shadowed_change(temp_dir, schema):
+    base = create_temp_file(temp_dir, "base.json", json.dumps({"database": {"host": "a", "port": 1}}))
+    overlay = create_temp_file(temp_dir, "overlay.json", json.dumps({"database": {"port": 2}}))
+    processor = ConfigurationProcessor(schema)
+    processor.load_config_file(base, "json")
+    processor.load_config_file(overlay, "json")
+    processor.reload()
+
+    create_temp_file(temp_dir, "base.json", json.dumps({"database": {"host": "a", "port": 99}}))
+    config, changed = processor.reload()
+    assert changed == set()
+    assert config["database"]["port"] == 2
+
+
+def test_reload_invalid_change_raises(temp_dir, schema):
+    path = create_temp_file(temp_dir, "config.json", json.dumps({"database": {"host": "a"}}))
+    processor = ConfigurationProcessor(schema)
+    processor.load_config_file(path, "json")
+    processor.reload()
+
+    create_temp_file(temp_dir, "config.json", json.dumps({"database": {"host": "a", "port": 0}, "extra": 1}))
+    with pytest.raises(ConfigurationError) as exc:
+        processor.reload()
+    assert str(exc.value) == "Configuration validation failed: Field 'database.port' value 0 is below minimum 1"
+
+    create_temp_file(temp_dir, "config.json", json.dumps({"database": {"host": "a", "port": 5}, "extra": 1}))
+    config, changed = processor.reload()
+    assert changed == {"database.port", "extra"}
+    assert config == {"database": {"host": "a", "port": 5}, "debug": False, "log_level": "INFO", "extra": 1}
+
+
+def test_reload_unreadable_file_keeps_state(temp_dir, schema):
+    path = create_temp_file(temp_dir, "config.json", json.dumps({"database": {"host": "a"}}))
+    processor = ConfigurationProcessor(schema)
+    processor.load_config_file(path, "json")
+    config, _ = processor.reload()
+
+    create_temp_file(temp_dir, "config.json", "{broken")
+    with pytest.raises(ConfigurationError) as exc:
+        processor.reload()
+    assert str(exc.value) == f"Failed to reload configuration file '{path}'"
+    assert processor.configurations == [{"database": {"host": "a"}}]
+
+
+def test_cache_dir_reuses_parsed_file(temp_dir, schema):
+    cache_dir = os.path.join(temp_dir, "cache")
+    path = create_temp_file(temp_dir, "config.ini", "[database]\nhost = db\nport = 5433\n")
+    os.utime(path, (1_600_000_000, 1_600_000_000))
+    first = ConfigurationProcessor(schema, cache_dir=cache_dir)
+    assert first.load_config_file(path, "ini")
+    assert len(os.listdir(cache_dir)) == 1
+
+    create_temp_file(temp_dir, "config.ini", "[database]\nhost = xx\nport = 5434\n")
+    os.utime(path, (1_600_000_000, 1_600_000_000))
+    second = ConfigurationProcessor(schema, cache_dir=cache_dir)
+    assert second.load_config_file(path, "ini")
+    assert second.configurations == first.configurations == [{"database": {"host": "db", "port": 5433}}]
+    assert second.configurations[0] is not first.configurations[0]
+
+
+def test_cache_dir_detects_changed_file(temp_dir, schema):
+    cache_dir = os.path.join(temp_dir, "cache")
+    path = create_temp_file(temp_dir, "config.json", json.dumps({"database": {"host": "a"}}))
+    ConfigurationProcessor(schema, cache_dir=cache_dir).load_config_file(path, "json")
+    stat = os.stat(path)
+    create_temp_file(temp_dir, "config.json", json.dumps({"database": {"host": "b"}}))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    processor = ConfigurationProcessor(schema, cache_dir=cache_dir)
+    assert processor.load_config_file(path, "json")
+    assert processor.configurations == [{"database": {"host": "b"}}]
+
+    create_temp_file(temp_dir, "config.json", "[1, 2]")
+    assert not processor.load_config_file(path, "json")
+
+
+def test_cache_dir_evicts_least_recently_used(temp_dir, schema):
+    cache_dir = os.path.join(temp_dir, "cache")
+    paths = [
+        create_temp_file(temp_dir, f"c{i}.json", json.dumps({"data": "x" * 300, "i": i}))
+        for i in range(4)
+    ]
+    processor = ConfigurationProcessor(schema, cache_dir=cache_dir, cache_max_bytes=1000)
+    for path in paths:
+        assert processor.load_config_file(path, "json")
+
+    sizes = [os.path.getsize(os.path.join(cache_dir, name)) for name in os.listdir(cache_dir)]
+    assert sum(sizes) <= 1000
+    assert len(sizes) == 2
+    assert [c["i"] for c in processor.configurations] == [0, 1, 2, 3]
+
+
+def test_cache_dir_ignores_corrupt_entries(temp_dir, schema):
+    cache_dir = os.path.join(temp_dir, "cache")
+    path = create_temp_file(temp_dir, "config.json", json.dumps({"database": {"host": "a"}}))
+    ConfigurationProcessor(schema, cache_dir=cache_dir).load_config_file(path, "json")
+    for name in os.listdir(cache_dir):
+        with open(os.path.join(cache_dir, name), "wb") as f:
+            f.write(b"\x00garbage")
+
+    processor = ConfigurationProcessor(schema, cache_dir=cache_dir)
+    assert processor.load_config_file(path, "json")
+    assert processor.configurations == [{"database": {"host": "a"}}]
+
+
+def test_load_config_files_keeps_input_order(temp_dir, schema):
+    paths = [
+        (create_temp_file(temp_dir, "a.json", json.dumps({"database": {"host": "a"}, "name": "first"})), "json"),
+        (os.path.join(temp_dir, "missing.json"), "json"),
+        (create_temp_file(temp_dir, "b.ini", "[database]\nhost = b\nport = 6000\n"), "ini"),
+        (create_temp_file(temp_dir, "bad.json", "{broken"), "json"),
+        (create_temp_file(temp_dir, "c.json", json.dumps({"name": "last"})), "yaml"),
+        (create_temp_file(temp_dir, "d.json", json.dumps({"debug": True})), "json"),
+    ]
+    processor = ConfigurationProcessor(schema)
+    assert processor.load_config_files(paths, workers=4) == [True, False, True, False, False, True]
+    assert processor.configurations == [
+        {"database": {"host": "a"}, "name": "first"},
+        {"database": {"host": "b", "port": 6000}},
+        {"debug": True},
+    ]
+
+    serial = ConfigurationProcessor(schema)
+    assert [serial.load_config_file(path, fmt) for path, fmt in paths] == [True, False, True, False, False, True]
+    assert serial.process_all() == processor.process_all()
+
+
+def test_load_config_files_parses_large_files_in_processes(temp_dir, schema, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    paths = [
+        (create_temp_file(temp_dir, f"c{i}.json", json.dumps({"section": {"index": i, "blob": "x" * i * 100_000}})),
+         "json")
+        for i in range(5)
+    ]
+    paths.append((create_temp_file(temp_dir, "bad.ini", "no section header\n"), "ini"))
+    deep = create_temp_file(temp_dir, "deep.json", '{"a": ' * 50_000 + "1" + "}" * 50_000)
+    paths.append((deep, "json"))
+    processor = ConfigurationProcessor(schema)
+    assert processor.load_config_files(paths, workers=3) == [True] * 5 + [False, True]
+    assert [c["section"]["index"] for c in processor.configurations[:5]] == [0, 1, 2, 3, 4]
+    assert processor.configurations[3]["section"]["blob"] == "x" * 300_000
+    serial = ConfigurationProcessor(schema)
+    assert serial.load_config_file(deep, "json")
+    assert processor.load_config_files([]) == []
+
+
+def test_load_config_files_async_matches_sync(temp_dir, schema):
+    import asyncio
+    paths = [
+        (create_temp_file(temp_dir, "a.json", json.dumps({"database": {"host": "a"}, "log_level": "debug"})), "json"),
+        (os.path.join(temp_dir, "missing.ini"), "ini"),
+        (create_temp_file(temp_dir, "b.ini", "[database]\nport = 7000\n"), "ini"),
+        (create_temp_file(temp_dir, "bad.json", "[]"), "json"),
+    ]
+    processor = ConfigurationProcessor(schema)
+
+    async def run():
+        loaded = await processor.load_config_files_async(paths, concurrency=2)
+        single = await processor.load_config_file_async(paths[1][0], "ini")
+        return loaded, single, await processor.process_all_async()
+
+    loaded, single, config = asyncio.run(run())
+    assert loaded == [True, False, True, False]
+    assert single is False
+    assert config == {
+        "database": {"host": "a", "port": 7000},
+        "debug": False,
+        "log_level": "DEBUG",
+    }
+
+
+def test_process_all_async_raises_configuration_error(schema):
+    import asyncio
+    processor = ConfigurationProcessor(schema)
+    processor.configurations = [{"database": {"port": 0}}]
+
+    with pytest.raises(ConfigurationError) as exc:
+        asyncio.run(processor.process_all_async())
+    with pytest.raises(ConfigurationError) as sync_exc:
+        processor.process_all()
+    assert str(exc.value) == str(sync_exc.value)
+
+
+def test_ini_parsing_subset(temp_dir, schema):
+    content = """# comment
+[server]
+Host = example.com
+port: 8080
+ratio = 2.5
+url = http://x:1/a=b
+enabled = on
+; another comment
+
+[Paths]
+root=/srv
+empty =
+"""
+    filepath = create_temp_file(temp_dir, "config.ini", content)
+    processor = ConfigurationProcessor(schema)
+    assert processor.load_config_file(filepath, "ini")
+    assert processor.configurations[0] == {
+        "server": {"host": "example.com", "port": 8080, "ratio": 2.5, "url": "http://x:1/a=b", "enabled": True},
+        "Paths": {"root": "/srv", "empty": ""},
+    }
+
+
+def test_ini_parsing_configparser_features(temp_dir, schema):
+    content = """[DEFAULT]
+base = /srv
+
+[app]
+path = %(base)s/app
+motd = first line
+  second line
+"""
+    filepath = create_temp_file(temp_dir, "config.ini", content)
+    processor = ConfigurationProcessor(schema)
+    assert processor.load_config_file(filepath, "ini")
+    assert processor.configurations[0] == {
+        "app": {"base": "/srv", "path": "/srv/app", "motd": "first line\nsecond line"},
+    }
+
+    duplicate = create_temp_file(temp_dir, "dup.ini", "[a]\nkey = 1\nKEY = 2\n")
+    assert not processor.load_config_file(duplicate, "ini")
+
+
+def test_streaming_json_load_matches_json_load(temp_dir, schema):
+    document = {
+        "database": {"host": "db", "port": 5432},
+        "routes": [
+            {"prefix": f"10.0.{i // 256}.{i % 256}/32", "weight": i / 4, "tags": ["a", "é"]} for i in range(3000)
+        ],
+        "limits": {"big": 10 ** 30, "neg": -1.5e-3, "flags": [True, False, None]},
+    }
+    filepath = create_temp_file(temp_dir, "big.json", json.dumps(document, indent=1))
+    assert os.path.getsize(filepath) > 4 * 64 * 1024
+    processor = ConfigurationProcessor(schema, json_stream_threshold=0)
+    assert processor.load_config_file(filepath, "json")
+    assert processor.configurations[0] == document
+    assert list(processor.configurations[0]) == ["database", "routes", "limits"]
+
+    for content in ['{"a": [1, 2,]}', '{"a": 1} x', '[1, 2]', '{"a": "unterminated', '{"a": 1.}']:
+        bad = create_temp_file(temp_dir, "bad.json", content)
+        assert not processor.load_config_file(bad, "json")
+    assert len(processor.configurations) == 1
+
+
+def test_streaming_json_reload(temp_dir, schema):
+    filepath = create_temp_file(temp_dir, "config.json", json.dumps({"database": {"host": "a"}}))
+    processor = ConfigurationProcessor(schema, json_stream_threshold=0)
+    processor.load_config_file(filepath, "json")
+    processor.reload()
+
+    create_temp_file(temp_dir, "config.json", json.dumps({"database": {"host": "b"}}))
+    config, changed = processor.reload()
+    assert changed == {"database.host"}
+    assert config["database"]["host"] == "b"
+
+
+def _tenant_configs(count):
+    for i in range(count):
+        config = {"database": {"host": f"db{i}", "port": i * 1000}, "log_level": "INFO"}
+        if i % 3 == 0:
+            del config["database"]["host"]
+        yield config
+
+
+def test_validate_many_streams_results_lazily(schema):
+    import itertools
+    processor = ConfigurationProcessor(schema)
+    results = processor.validate_many(_tenant_configs(10 ** 9))
+    first = list(itertools.islice(results, 4))
+    assert first == [
+        (0, False, ["Required field 'database.host' is missing", "Field 'database.port' value 0 is below minimum 1"]),
+        (1, True, []),
+        (2, True, []),
+        (3, False, ["Required field 'database.host' is missing"]),
+    ]
+
+
+def test_validate_many_process_pool_matches_serial(schema):
+    processor = ConfigurationProcessor(schema)
+    serial = list(processor.validate_many(_tenant_configs(200)))
+    pooled = list(processor.validate_many(_tenant_configs(200), workers=2, chunk_size=16))
+    assert pooled == serial
+    assert [index for index, _, _ in pooled] == list(range(200))
+    assert sum(ok for _, ok, _ in pooled) == 44
+
+
+def test_validate_configuration_error_budget(schema):
+    processor = ConfigurationProcessor(schema)
+    config = {"database": {"port": 0, "username": "ab"}, "log_level": "TRACE", "timeout": 99.0, "features": []}
+    ok, errors = processor.validate_configuration(config)
+    assert not ok and len(errors) == 6
+
+    assert processor.validate_configuration(config, max_errors=1) == (False, errors[:1])
+    assert processor.validate_configuration(config, max_errors=3) == (False, errors[:3])
+    assert processor.validate_configuration(config, max_errors=100) == (False, errors)
+    assert processor.validate_configuration({"database": {"host": "db"}}, max_errors=1) == (True, [])
+    with pytest.raises(ValueError):
+        processor.validate_configuration(config, max_errors=0)
+
+
+def test_validate_configuration_error_budget_codegen(schema):
+    config = {"database": {"port": "x"}, "debug": "no", "features": "abc"}
+    interpreted = ConfigurationProcessor(schema).validate_configuration(config)
+    generated = ConfigurationProcessor(schema, codegen=True)
+    assert generated.validate_configuration(config, max_errors=2) == (False, interpreted[1][:2])
+    assert list(generated.validate_many([config, {}], max_errors=1)) == [
+        (0, False, interpreted[1][:1]),
+        (1, False, ["Required field 'database' is missing"]),
+    ]
+
+
+def test_validate_configuration_structured_issues(schema):
+    processor = ConfigurationProcessor(schema)
+    config = {"database": {"port": 0, "username": "ab"}, "log_level": "TRACE", "timeout": "x"}
+    ok, issues = processor.validate_configuration(config, structured=True)
+    assert not ok
+    assert all(isinstance(issue, ValidationIssue) for issue in issues)
+    assert [(issue.path, issue.code) for issue in issues] == [
+        ("database.host", "missing"),
+        ("database.port", "min_value"),
+        ("database.username", "min_length"),
+        ("log_level", "allowed_values"),
+        ("timeout", "type"),
+    ]
+    assert (issues[1].value, issues[1].bound) == (0, 1)
+    assert (issues[2].value, issues[2].bound) == (2, 3)
+    assert issues[3].bound == ["DEBUG", "INFO", "WARNING", "ERROR"]
+    assert [issue.message for issue in issues] == processor.validate_configuration(config)[1]
+    assert processor.validate_configuration(config, max_errors=2, structured=True) == (False, issues[:2])
+    generated = ConfigurationProcessor(schema, codegen=True)
+    assert generated.validate_configuration(config, structured=True) == (False, issues)
+
+
+def test_configuration_error_carries_issues(schema, temp_dir):
+    processor = ConfigurationProcessor(schema)
+    path = create_temp_file(temp_dir, "bad.json", '{"database": {"host": "db", "port": 70000}, "features": []}')
+    processor.load_config_file(path, "json")
+    with pytest.raises(ConfigurationError) as info:
+        processor.process_all()
+    assert [(issue.path, issue.code) for issue in info.value.issues] == [
+        ("database.port", "max_value"),
+        ("features", "min_length"),
+    ]
+    assert str(info.value) == (
+        "Configuration validation failed: Field 'database.port' value 70000 is above maximum 65535; "
+        "Field 'features' length 0 is below minimum 1"
+    )
+    assert info.value.args == (str(info.value),)
+    assert repr(info.value) == f"ConfigurationError({str(info.value)!r})"
+    unpickled = pickle.loads(pickle.dumps(ConfigurationError(issues=info.value.issues)))
+    assert unpickled.issues == info.value.issues and str(unpickled) == str(info.value)
+
+
+def test_allowed_values_large_enumeration_with_unhashable_members():
+    allowed = [f"R{i}" for i in range(1000)] + [["eu", "us"], {"zone": 1}, 7, True]
+    schema = {"region": {"allowed_values": allowed}}
+    for codegen in (False, True):
+        processor = ConfigurationProcessor(schema, codegen=codegen)
+        for value in ("R999", ["eu", "us"], {"zone": 1}, 7, 1, 7.0):
+            assert processor.validate_configuration({"region": value}) == (True, [])
+        ok, errors = processor.validate_configuration({"region": ["us"]})
+        assert not ok
+        assert errors == [f"Field 'region' value '['us']' not in allowed values {allowed!r}"]
+        assert not processor.validate_configuration({"region": "R1000"})[0]
+
+
+def test_process_all_result_cache(schema, temp_dir):
+    processor = ConfigurationProcessor(schema, result_cache_size=2)
+    path = create_temp_file(temp_dir, "app.json", '{"database": {"host": "db"}, "features": ["a"], "log_level": "warning"}')
+    processor.load_config_file(path, "json")
+    first = processor.process_all()
+    second = processor.process_all()
+    assert isinstance(first, ConfigView)
+    assert first == second
+    assert first["log_level"] == "WARNING" and first["database"]["port"] == 5432
+    assert processor.result_cache_info() == ResultCacheInfo(hits=1, misses=1, max_entries=2, entries=1)
+    with pytest.raises(TypeError):
+        first["database"]["port"] = 1
+    processor.configurations[0]["database"]["port"] = 0
+    with pytest.raises(ConfigurationError) as info:
+        processor.process_all()
+    with pytest.raises(ConfigurationError) as again:
+        processor.process_all()
+    assert str(again.value) == str(info.value) == (
+        "Configuration validation failed: Field 'database.port' value 0 is below minimum 1"
+    )
+    assert [tuple(issue) for issue in again.value.issues] == [("database.port", "min_value", 0, 1)]
+    del processor.configurations[0]["database"]["port"]
+    assert processor.process_all() == first
+    assert processor.result_cache_info().hits == 3
+    assert ConfigurationProcessor(schema).result_cache_info() is None
+
+
+def test_process_all_indexed_paths(schema, temp_dir):
+    path = create_temp_file(
+        temp_dir, "app.json",
+        '{"database": {"host": "db", "pool": {"size": 4}}, "features": ["a"], "log_level": "warning", "extra": {"x": 1}}',
+    )
+    processor = ConfigurationProcessor(schema)
+    processor.load_config_file(path, "json")
+    indexed = processor.process_all(indexed=True)
+    assert isinstance(indexed, IndexedConfig)
+    assert indexed == processor.process_all()
+    assert indexed.get("database.port") == 5432
+    assert indexed.get("database.pool.size") == 4
+    assert indexed.get("database.pool") == {"size": 4}
+    assert indexed.get("log_level") == "WARNING"
+    assert indexed.get("database.missing", "fallback") == "fallback"
+    assert list(indexed.leaf_paths()) == [
+        "database.host", "database.port", "database.pool.size", "debug", "log_level", "features", "extra.x",
+    ]
+    assert list(indexed.scan("database.*")) == [("database.host", "db"), ("database.port", 5432), ("database.pool.size", 4)]
+    assert list(indexed.scan("database.pool")) == [("database.pool.size", 4)]
+    assert list(indexed.scan("log_level")) == []
+    assert len(list(indexed.scan(""))) == 7
+    cached = ConfigurationProcessor(schema, result_cache_size=2)
+    cached.load_config_file(path, "json")
+    cached.process_all()
+    again = cached.process_all(indexed=True)
+    assert list(again.leaf_paths()) == list(indexed.leaf_paths())
+    assert again.get("extra.x") == 1
+    assert cached.result_cache_info().hits == 1
+
+
+def test_transform_values_lazy_view(schema):
+    processor = ConfigurationProcessor(schema)
+    config = {
+        "database": {"host": "db", "port": "5433", "pool": {"size": 4}},
+        "log_level": "warning",
+        "timeout": "2.5",
+        "name": "  svc  ",
+        "features": ["a"],
+        "extra": [1, 2],
+    }
+    view = processor.transform_values(config, lazy=True)
+    assert isinstance(view, LazyConfigView)
+    assert view["log_level"] == "WARNING"
+    config["log_level"] = "error"
+    config["name"] = "  other  "
+    assert view["log_level"] == "WARNING"
+    assert view["name"] == "other"
+    assert view["database"] is view["database"]
+    assert view["database"]["port"] == 5433
+    assert view["debug"] is False
+    assert "debug" in view and "missing" not in view
+    with pytest.raises(KeyError):
+        view["missing"]
+    with pytest.raises(TypeError):
+        view["debug"] = True
+    config["log_level"] = "warning"
+    expected = processor.transform_values(config)
+    assert list(view) == list(expected)
+    assert view.to_dict() == expected and view == expected
+    materialized = view.to_dict()
+    materialized["extra"].append(3)
+    assert view["extra"] == [1, 2]
+
+
+def test_process_tenant_overlays_shared_base(schema, temp_dir):
+    base = create_temp_file(
+        temp_dir, "base.json",
+        '{"database": {"host": "db", "username": "x"}, "features": ["a"], "cache": {"ttl": 5}}',
+    )
+    processor = ConfigurationProcessor(schema)
+    processor.load_config_file(base, "json")
+    with pytest.raises(ConfigurationError) as info:
+        processor.process_all()
+    assert "database.username" in str(info.value)
+    tenant = processor.process_tenant({"database": {"username": "tenant-a"}, "log_level": "debug", "region": "eu"})
+    reference = ConfigurationProcessor(schema)
+    reference.configurations = processor.configurations + [
+        {"database": {"username": "tenant-a"}, "log_level": "debug", "region": "eu"}
+    ]
+    assert tenant == reference.process_all()
+    assert list(tenant) == list(reference.process_all())
+    other = processor.process_tenant({"timeout": 2, "database": {"username": "tenant-c"}})
+    assert other["cache"] == tenant["cache"] == {"ttl": 5} and other["timeout"] == 2.0
+    with pytest.raises(ConfigurationError) as info:
+        processor.process_tenant({"database": {"port": 0}})
+    assert str(info.value) == (
+        "Configuration validation failed: Field 'database.port' value 0 is below minimum 1; "
+        "Field 'database.username' length 1 is below minimum 3"
+    )
+    assert processor.process_tenant({"database": {"username": "tenant-b"}})["database"]["username"] == "tenant-b"
+    with pytest.raises(TypeError):
+        processor.process_tenant(["not", "a", "dict"])
+
+
+def test_config_holder_publishes_atomic_snapshots(schema, temp_dir):
+    content = '{{"database": {{"host": "db", "port": {port}}}, "features": ["a"]}}'
+    path = create_temp_file(temp_dir, "app.json", content.format(port=5432))
+    processor = ConfigurationProcessor(schema)
+    processor.load_config_file(path, "json")
+    holder = ConfigHolder(processor)
+    first = holder.snapshot
+    assert first.generation == 1 and first.config["database"]["port"] == 5432
+    with pytest.raises(TypeError):
+        first.config["debug"] = True
+    assert holder.reload() is first
+    held = first.config["database"]
+
+    create_temp_file(temp_dir, "app.json", content.format(port=6000))
+    second = holder.reload()
+    assert second.generation == 2 and second.config["database"]["port"] == 6000
+    assert holder.snapshot is second
+    assert first.config["database"]["port"] == 5432 and held["port"] == 5432
+
+    create_temp_file(temp_dir, "app.json", content.format(port=0))
+    with pytest.raises(ConfigurationError):
+        holder.reload()
+    assert holder.snapshot is second
+    assert second.config["database"]["port"] == 6000
+
+    create_temp_file(temp_dir, "app.json", content.format(port=7000))
+    third = holder.reload()
+    assert third.generation == 3 and third.config["database"]["port"] == 7000
+    assert second.config["database"]["port"] == 6000
+
+
+def test_binary_snapshot_round_trip_and_staleness(schema, temp_dir):
+    content = '{{"database": {{"host": "db", "port": {port}}}, "features": ["a"], "extra": [1, 2]}}'
+    path = create_temp_file(temp_dir, "app.json", content.format(port=5432))
+    overrides = create_temp_file(temp_dir, "local.ini", "[database]\nusername = admin\n")
+    snapshot = os.path.join(temp_dir, "config.snap")
+    processor = ConfigurationProcessor(schema)
+    processor.load_config_file(path, "json")
+    processor.load_config_file(overrides, "ini")
+    processor.save_snapshot(snapshot)
+    worker = ConfigurationProcessor(schema)
+    loaded = worker.load_snapshot(snapshot)
+    assert loaded == processor.process_all()
+    assert list(loaded) == list(processor.process_all())
+    assert worker.configurations == []
+    create_temp_file(temp_dir, "app.json", content.format(port=6000))
+    with pytest.raises(ConfigurationError, match="Stale configuration snapshot"):
+        worker.load_snapshot(snapshot)
+    rebuilt = worker.load_snapshot(snapshot, rebuild=True)
+    assert rebuilt["database"] == {"host": "db", "port": 6000, "username": "admin"}
+    assert worker.reload()[0] == rebuilt
+    assert worker.process_tenant({}) == rebuilt
+    assert ConfigurationProcessor(schema).load_snapshot(snapshot) == rebuilt
+    changed = dict(schema, timeout={"type": "float", "default": 1.0})
+    with pytest.raises(ConfigurationError, match="schema changed"):
+        ConfigurationProcessor(changed).load_snapshot(snapshot)
+    assert ConfigurationProcessor(changed).load_snapshot(snapshot, rebuild=True)["timeout"] == 1.0
+    create_temp_file(temp_dir, "broken.snap", "not a snapshot")
+    with pytest.raises(ConfigurationError, match="Invalid configuration snapshot"):
+        worker.load_snapshot(os.path.join(temp_dir, "broken.snap"), rebuild=True)
+    in_memory = ConfigurationProcessor(schema)
+    in_memory.configurations = [{"database": {"host": "db"}}]
+    with pytest.raises(ValueError):
+        in_memory.save_snapshot(snapshot)
+    create_temp_file(temp_dir, "app.json", content.format(port=0))
+    with pytest.raises(ConfigurationError, match="below minimum"):
+        worker.load_snapshot(snapshot, rebuild=True)
+
+
+def test_binary_snapshot_sources_survive_a_directory_change(schema, temp_dir, monkeypatch):
+    create_temp_file(temp_dir, "app.json", '{"database": {"host": "db"}}')
+    elsewhere = os.path.join(temp_dir, "elsewhere")
+    os.mkdir(elsewhere)
+    monkeypatch.chdir(temp_dir)
+    processor = ConfigurationProcessor(schema)
+    assert processor.load_config_file("app.json", "json")
+    processor.save_snapshot("config.snap")
+    snapshot = os.path.join(temp_dir, "config.snap")
+    monkeypatch.chdir(elsewhere)
+    assert ConfigurationProcessor(schema).load_snapshot(snapshot) == processor.process_all()
+    create_temp_file(temp_dir, "app.json", '{"database": {"host": "db2"}}')
+    rebuilt = ConfigurationProcessor(schema).load_snapshot(snapshot, rebuild=True)
+    assert rebuilt["database"]["host"] == "db2"
+
+
+def test_batch_cli_writes_one_ndjson_line_per_group(schema, temp_dir, capsys):
+    create_temp_file(temp_dir, "schema.json", json.dumps(schema))
+    create_temp_file(temp_dir, "base.json", '{"database": {"host": "db"}, "features": ["a"]}')
+    create_temp_file(temp_dir, "svc-a.conf", "[database]\nport = 6000\n")
+    create_temp_file(temp_dir, "svc-b.ini", "[database]\nport = 70000\n")
+    create_temp_file(temp_dir, "manifest.json", json.dumps({
+        "svc-a": ["base.json", "svc-a.conf"],
+        "svc-b": ["base.json", ["svc-b.ini", "ini"]],
+        "svc-c": ["missing.json"],
+    }))
+    schema_path = os.path.join(temp_dir, "schema.json")
+    manifest_path = os.path.join(temp_dir, "manifest.json")
+    out = os.path.join(temp_dir, "out.ndjson")
+    argv = ["--schema", schema_path, "--manifest", manifest_path, "--output", out]
+    assert main(argv + ["--emit-config"]) == 1
+    with open(out) as f:
+        records = [json.loads(line) for line in f]
+    assert [(r["group"], r["ok"]) for r in records] == [("svc-a", True), ("svc-b", False), ("svc-c", False)]
+    assert records[0]["config"]["database"] == {"host": "db", "port": 6000}
+    assert records[1]["errors"] == ["Field 'database.port' value 70000 is above maximum 65535"]
+    assert records[2]["errors"] == [f"Failed to load configuration file '{os.path.join(temp_dir, 'missing.json')}'"]
+    assert "3 groups, 2 failed" in capsys.readouterr().err
+    assert main(argv + ["--workers", "2", "--chunk-size", "1"]) == 1
+    with open(out) as f:
+        pooled = [json.loads(line) for line in f]
+    assert pooled == [{k: v for k, v in r.items() if k != "config"} for r in records]
+    create_temp_file(temp_dir, "manifest.json", json.dumps({"svc-a": ["base.json", "svc-a.conf"]}))
+    assert main(argv) == 0
+    assert main(["--schema", schema_path, "--manifest", os.path.join(temp_dir, "nope.json")]) == 2
+    assert main(["--schema", schema_path]) == 2
+    assert main(["--schema", schema_path, "--manifest", manifest_path,
+                 "--output", os.path.join(temp_dir, "missing", "out.ndjson")]) == 2
+    assert main(argv + ["--workers", "many"]) == 2
+
+
+def test_stream_jsonl_yields_per_line_results(schema, temp_dir):
+    lines = [
+        '{"database": {"host": "db", "port": "5432"}, "features": ["a"]}',
+        "",
+        '{"database": {"host": "db", "port": 0}}',
+        "{not json",
+        "[1, 2]",
+        '{"database": {"host": "db", "username": "ops"}}',
+    ]
+    path = create_temp_file(temp_dir, "export.jsonl", "\n".join(lines) + "\n")
+    out = os.path.join(temp_dir, "out.jsonl")
+    processor = ConfigurationProcessor(schema)
+    stream = processor.stream_jsonl(path, output=out)
+    results = list(stream)
+    assert [(index, ok) for index, ok, _ in results] == [(0, True), (2, False), (3, False), (4, False), (5, True)]
+    assert results[1][2] == ["Field 'database.port' value 0 is below minimum 1"]
+    assert results[2][2][0].startswith("Invalid JSON document on line 4: ")
+    assert results[3][2] == ["Invalid JSON document on line 5: not a JSON object"]
+    with open(out) as f:
+        written = [json.loads(line) for line in f]
+    expected = processor.transform_values(json.loads(lines[0]))
+    assert written[0] == expected and written[0]["database"]["port"] == 5432
+    assert len(written) == 2
+    stats = stream.stats
+    assert isinstance(stats, StreamStats)
+    assert (stats.documents, stats.valid, stats.bytes_read) == (5, 2, os.path.getsize(path))
+    with pytest.raises(RuntimeError):
+        list(stream)
+    structured = list(processor.stream_jsonl(path, structured=True))
+    assert structured[1][2][0].code == "min_value"
+
+
+def test_stage_instrumentation(schema, temp_dir):
+    events = []
+    processor = ConfigurationProcessor(schema, on_stage=events.append)
+    json_content = '{"database": {"host": "db", "port": 0}, "features": ["a"]}'
+    ini_content = "[database]\nusername = admin\n"
+    assert processor.load_config_file(create_temp_file(temp_dir, "a.json", json_content), "json")
+    assert processor.load_config_file(create_temp_file(temp_dir, "b.ini", ini_content), "ini")
+    merged = processor.merge_configurations()
+    transformed = processor.transform_values(merged)
+    assert not processor.validate_configuration(transformed)[0]
+    with pytest.raises(ConfigurationError):
+        processor.process_all()
+
+    assert [event.stage for event in events] == [
+        "read", "parse_json", "read", "parse_ini", "merge", "transform", "validate", "process",
+    ]
+    assert all(isinstance(event, StageEvent) and event.seconds >= 0 for event in events)
+    snapshot = processor.stats_snapshot()
+    stages = snapshot.stages
+    assert stages["read"].calls == 2
+    assert stages["read"].bytes_read == len(json_content) + len(ini_content)
+    assert stages["parse_json"].keys_visited == 4
+    assert stages["parse_ini"].keys_visited == 2
+    assert stages["merge"].keys_visited == 6
+    assert stages["validate"].errors == 1 and stages["process"].errors == 1
+    assert stages["reload"] == StageStats()
+    assert snapshot.callback_errors == 0
+
+    processor.reset_stats()
+    assert processor.stats_snapshot().stages["read"].calls == 0
+    assert ConfigurationProcessor(schema).stats_snapshot() is None
+
+
+def test_stage_instrumentation_callback_errors_are_contained(schema, temp_dir):
+    def broken(event):
+        raise RuntimeError("exporter down")
+
+    processor = ConfigurationProcessor(schema, on_stage=broken)
+    assert processor.load_config_file(create_temp_file(temp_dir, "a.json", '{"database": {"host": "db"}}'), "json")
+    configs = [{"database": {"host": "db"}}, {"database": {}}] * 20
+    pooled = list(processor.validate_many(configs, workers=2, chunk_size=8))
+    assert [ok for _, ok, _ in pooled] == [True, False] * 20
+    snapshot = processor.stats_snapshot()
+    assert snapshot.stages["validate"].calls == 40
+    assert snapshot.stages["validate"].errors == 20
+    assert snapshot.callback_errors == 2 + 5
+
+
+def test_thousand_level_nesting_without_recursion():
+    depth = 1000
+    schema = {"port": {"type": "integer", "min_value": 1}}
+    base = {"port": "0"}
+    overlay = {"port": "8080"}
+    for _ in range(depth):
+        schema = {"child": {"type": "dict", "required": True, "nested_schema": schema}, "name": {"type": "string", "transform": "strip"}}
+        base = {"child": base, "name": " x "}
+        overlay = {"child": overlay}
+    leaf_path = ".".join(["child"] * depth) + ".port"
+    for codegen in (False, True):
+        processor = ConfigurationProcessor(schema, codegen=codegen)
+        processor.configurations = [base]
+        with pytest.raises(ConfigurationError) as info:
+            processor.process_all()
+        assert str(info.value) == f"Configuration validation failed: Field '{leaf_path}' value 0 is below minimum 1"
+        transformed = processor.transform_values(processor.merge_configurations())
+        assert processor.validate_configuration(transformed) == (
+            False, [f"Field '{leaf_path}' value 0 is below minimum 1"],
+        )
+
+        processor.configurations = [base, overlay]
+        result = processor.process_all()
+        node = result
+        for _ in range(depth):
+            assert node["name"] == "x"
+            node = node["child"]
+        assert node == {"port": 8080}
+        assert processor.reload()[0] is not None
+
+
+def test_load_json_nested_past_recursion_limit(temp_dir):
+    depth = 3000
+    path = create_temp_file(temp_dir, "deep.json", '{"a": ' * depth + '[1, {"b": 2}]' + "}" * depth)
+    for threshold in (None, 0):
+        processor = ConfigurationProcessor({}, json_stream_threshold=threshold)
+        assert processor.load_config_file(path, "json")
+        node = processor.merge_configurations()
+        for _ in range(depth):
+            node = node["a"]
+        assert node == [1, {"b": 2}]
@@ -1,31 +1,167 @@
 import json
 import configparser
 import os
-from typing import Any, Dict, List, Tuple
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+
+class ValidationIssue(NamedTuple):
+    """One validation error; .message / str() formats the exact error string."""
+    path: str
+    code: str
+    value: Any = None
+    bound: Any = None
+
+
+class ResultCacheInfo(NamedTuple):
+    """Counters returned by ConfigurationProcessor.result_cache_info()."""
+    hits: int
+    misses: int
+    max_entries: int
+    entries: int
+
+
+class StageEvent(NamedTuple):
+    """One instrumented stage run, passed to the on_stage callback."""
+    stage: str
+    seconds: float
+    bytes_read: int = 0
+    keys_visited: int = 0
+    errors: int = 0
+    calls: int = 1
+
+
+class StageStats(NamedTuple):
+    """Accumulated totals for one stage."""
+    calls: int = 0
+    seconds: float = 0.0
+    bytes_read: int = 0
+    keys_visited: int = 0
+    errors: int = 0
+
+
+class ProcessorStats(NamedTuple):
+    """Snapshot returned by ConfigurationProcessor.stats_snapshot()."""
+    stages: Dict[str, StageStats]
+    callback_errors: int
 
 
 class ConfigurationError(Exception):
-    """Raised when configuration validation fails in process_all."""
+    """Raised when configuration validation fails in process_all.
+
+    .issues holds the ValidationIssue records behind the message.
+    """
+    pass
+
+
+class ConfigView:
+    """Read-only Mapping over a merged configuration (see 01-description.md)."""
+    pass
+
+
+class ConfigListView:
+    """Read-only Sequence over a list inside a ConfigView."""
+    pass
+
+
+class IndexedConfig(ConfigView):
+    """ConfigView returned by process_all(indexed=True).
+
+    get("a.b.c") looks a dotted path up in O(1); scan("a.b.*") yields
+    (path, value) for the leaves under a prefix; leaf_paths() iterates all
+    leaf paths in output order.
+    """
+    pass
+
+
+class LazyConfigView:
+    """Read-only Mapping returned by transform_values(config, lazy=True).
+
+    Each key is transformed on first read and memoized; nested schema dicts are
+    child views. to_dict() materializes a copy equal to transform_values(config).
+    """
     pass
 
 
+class StreamStats(NamedTuple):
+    """Live counters of a JsonlStream; seconds excludes the consumer's time."""
+    documents: int
+    valid: int
+    bytes_read: int
+    seconds: float
+
+    @property
+    def docs_per_second(self) -> float:
+        raise NotImplementedError
+
+
+class JsonlStream:
+    """Single-use iterator returned by ConfigurationProcessor.stream_jsonl.
+
+    Yields (line_index, ok, errors) per non-blank line, reading the input a
+    block at a time.
+    """
+
+    @property
+    def stats(self) -> StreamStats:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[Tuple[int, bool, Union[List[str], List[ValidationIssue]]]]:
+        raise NotImplementedError
+
+
 class ConfigurationProcessor:
     """Implement the configuration processing pipeline.
 
     Required public API:
-      - __init__(schema_definition: dict)
+      - __init__(schema_definition: dict, codegen: bool = False, cache_dir: str | None = None,
+                 cache_max_bytes: int = 64 * 1024 * 1024, json_stream_threshold: int | None = None,
+                 result_cache_size: int = 0, instrument: bool = False,
+                 on_stage: Callable[[StageEvent], None] | None = None)
       - load_config_file(filepath: str, file_format: str) -> bool
-      - merge_configurations() -> dict
-      - validate_configuration(config: dict) -> tuple[bool, list[str]]
-      - transform_values(config: dict) -> dict
-      - process_all() -> dict
+      - load_config_files(paths_with_formats, workers: int | None = None) -> list[bool]
+      - async load_config_file_async(filepath: str, file_format: str) -> bool
+      - async load_config_files_async(paths_with_formats, concurrency: int = 8) -> list[bool]
+      - merge_configurations(readonly: bool = False) -> dict | ConfigView
+      - validate_configuration(config: dict, max_errors: int | None = None,
+                               structured: bool = False) -> tuple[bool, list[str] | list[ValidationIssue]]
+      - validate_many(configs, workers: int | None = None, chunk_size: int = 64, max_errors: int | None = None,
+                      structured: bool = False) -> Iterator[tuple[int, bool, list[str] | list[ValidationIssue]]]
+      - transform_values(config: dict, lazy: bool = False) -> dict | LazyConfigView
+      - process_all(indexed: bool = False) -> dict | ConfigView | IndexedConfig
+      - async process_all_async(indexed: bool = False) -> dict | ConfigView | IndexedConfig
+      - result_cache_info() -> ResultCacheInfo | None
+      - stats_snapshot() -> ProcessorStats | None
+      - reset_stats() -> None
+      - reload() -> tuple[ConfigView, set[str]]
+      - process_tenant(overlay: dict) -> ConfigView
+      - stream_jsonl(path: str, output: str | None = None, structured: bool = False) -> JsonlStream
+      - save_snapshot(path: str) -> None
+      - load_snapshot(path: str, rebuild: bool = False) -> dict
 
     See 01-description.md for exact behavior and error messages.
     """
 
-    def __init__(self, schema_definition: dict):
+    def __init__(
+        self,
+        schema_definition: dict,
+        codegen: bool = False,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        json_stream_threshold: Optional[int] = None,
+        result_cache_size: int = 0,
+        instrument: bool = False,
+        on_stage: Optional[Callable[[StageEvent], None]] = None,
+    ):
         self.schema = schema_definition
         self.configurations: List[dict] = []
+        self.codegen = codegen
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.json_stream_threshold = json_stream_threshold
+        self.result_cache_size = result_cache_size
+        self.instrument = instrument
+        self.on_stage = on_stage
 
     # ---------- Implement below ----------
 
@@ -35,38 +171,219 @@ class ConfigurationProcessor:
         Return True on success, False on failure.
         Must handle file not found, parser errors, and unsupported file_format.
         INI values should parse booleans and numeric (int/float) literals where possible.
+        With cache_dir set, reuse parsed results stored there (keyed by path, size,
+        mtime and content hash) and evict least-recently-used entries beyond
+        cache_max_bytes.
+        With json_stream_threshold set, parse JSON files of at least that many
+        bytes incrementally from the file instead of reading the whole text.
         """
         raise NotImplementedError
 
-    def merge_configurations(self) -> dict:
+    def load_config_files(
+        self, paths_with_formats: Iterable[Tuple[str, str]], workers: Optional[int] = None,
+    ) -> List[bool]:
+        """Load many (filepath, file_format) pairs concurrently.
+
+        Read files on a thread pool of up to `workers` threads and parse large
+        documents on a process pool. Append successful results to
+        self.configurations in input order and return one bool per pair,
+        exactly as calling load_config_file for each pair in turn would.
+        """
+        raise NotImplementedError
+
+    async def load_config_file_async(self, filepath: str, file_format: str) -> bool:
+        """Awaitable load_config_file: file I/O and parsing run off the event loop."""
+        raise NotImplementedError
+
+    async def load_config_files_async(
+        self, paths_with_formats: Iterable[Tuple[str, str]], concurrency: int = 8,
+    ) -> List[bool]:
+        """Awaitable load_config_files with at most `concurrency` files in flight.
+
+        Results are registered in input order; the return value matches
+        load_config_files for the same inputs.
+        """
+        raise NotImplementedError
+
+    def merge_configurations(self, readonly: bool = False):
         """Deep-merge configurations in load order (later overrides earlier).
 
         Lists are replaced (not concatenated).
         Return {} if no configurations were loaded.
+        Subtrees contributed by a single file are shared, not copied.
+        With readonly=True, return a ConfigView instead of a dict.
         """
         raise NotImplementedError
 
-    def validate_configuration(self, config: dict) -> Tuple[bool, List[str]]:
+    def validate_configuration(
+        self, config: dict, max_errors: Optional[int] = None, structured: bool = False,
+    ) -> Tuple[bool, Union[List[str], List[ValidationIssue]]]:
         """Validate config against self.schema, returning (is_valid, errors).
 
+        max_errors=None collects every error; max_errors=K stops after the
+        first K (1 = fail-fast) without running the remaining checks.
+        structured=True returns ValidationIssue records instead of strings.
+
         Must emit errors with exact strings specified in 01-description.md.
         Supports nested dicts via 'nested_schema' using dot-paths.
         """
         raise NotImplementedError
 
-    def transform_values(self, config: dict) -> dict:
+    def validate_many(
+        self, configs: Iterable[dict], workers: Optional[int] = None, chunk_size: int = 64,
+        max_errors: Optional[int] = None, structured: bool = False,
+    ) -> Iterator[Tuple[int, bool, Union[List[str], List[ValidationIssue]]]]:
+        """Lazily yield (index, is_valid, errors) for each config, in input order.
+
+        Results equal validate_configuration(config, max_errors, structured) for each item. With
+        workers > 1, validate chunks of chunk_size configs on a process pool
+        whose workers receive the schema once (pool initializer), keeping only
+        a bounded number of chunks in flight.
+        """
+        raise NotImplementedError
+
+    def transform_values(self, config: dict, lazy: bool = False) -> Union[dict, LazyConfigView]:
         """Apply defaults, type coercion, and transforms per schema.
 
         - Coerce strings to int/float/bool as specified.
         - Any-type to string for 'string' fields.
         - On conversion failure, leave original value.
         - Recurse into nested dicts using 'nested_schema'.
+        lazy=True returns a LazyConfigView that does this per key on first read.
         """
         raise NotImplementedError
 
-    def process_all(self) -> dict:
+    def process_all(self, indexed: bool = False) -> Union[dict, ConfigView, IndexedConfig]:
         """Merge, transform, validate; raise ConfigurationError if invalid.
 
         Error format: "Configuration validation failed: {error1}; {error2}"
+        With result_cache_size > 0, outcomes are memoized in an LRU keyed by the
+        schema and the content of each loaded configuration; results are then
+        returned as ConfigView and cached failures re-raised.
+        indexed=True returns an IndexedConfig whose dotted-path index is built
+        in the same pass as the result.
+        """
+        raise NotImplementedError
+
+    def result_cache_info(self) -> Optional[ResultCacheInfo]:
+        """Hit/miss counters of the process_all result cache, None when disabled."""
+        raise NotImplementedError
+
+    def stats_snapshot(self) -> Optional[ProcessorStats]:
+        """Per-stage time and counters (read, parse_json, parse_ini, merge,
+        transform, validate, process, reload, tenant); None unless
+        instrument=True or on_stage is set. Each stage run is also passed to
+        on_stage as a StageEvent.
+        """
+        raise NotImplementedError
+
+    def reset_stats(self) -> None:
+        """Zero the instrumentation counters."""
+        raise NotImplementedError
+
+    def reload(self) -> Tuple[ConfigView, Set[str]]:
+        """Incrementally re-process after loaded files changed on disk.
+
+        Re-read every file loaded with load_config_file; re-parse only those
+        whose content hash changed, re-merge only the key paths they touch and
+        re-validate only the schema fields under those paths.
+        Return (config, changed) where config is a read-only ConfigView equal
+        to a fresh process_all() (the processor keeps diffing against it) and
+        changed is the set of dotted paths whose merged value changed (every
+        top-level key on the first call).
+        Raise ConfigurationError like process_all() when the result is invalid,
+        or "Failed to reload configuration file '{path}'" if a file can no
+        longer be read or parsed (nothing is updated in that case).
         """
         raise NotImplementedError
+
+    def process_tenant(self, overlay: dict) -> ConfigView:
+        """Final config for one tenant: the loaded configurations plus overlay.
+
+        Equal to process_all() with overlay appended as the last layer, and
+        raises the same ConfigurationError. The base layers are merged and
+        processed once; each call only applies the overlay, sharing every
+        subtree it does not touch with the base.
+        """
+        raise NotImplementedError
+
+    def stream_jsonl(self, path: str, output: Optional[str] = None, structured: bool = False) -> JsonlStream:
+        """Transform and validate every line of a JSONL file with bounded memory.
+
+        Valid documents are written to output as JSONL when it is given. A
+        line that is not a JSON object yields the error
+        "Invalid JSON document on line {n}: {detail}".
+        """
+        raise NotImplementedError
+
+    def save_snapshot(self, path: str) -> None:
+        """Write the validated process_all result to a marshal snapshot.
+
+        Tagged with the schema fingerprint and each loaded file's path, format,
+        size, mtime and content hash; written atomically.
+        """
+        raise NotImplementedError
+
+    def load_snapshot(self, path: str, rebuild: bool = False) -> dict:
+        """Return the result stored by save_snapshot without reprocessing.
+
+        Raise ConfigurationError("Stale configuration snapshot '{path}': ...")
+        when the schema or a source changed, unless rebuild=True, which reloads
+        the recorded files, reprocesses them and rewrites the snapshot.
+        """
+        raise NotImplementedError
+
+    async def process_all_async(self, indexed: bool = False) -> Union[dict, ConfigView, IndexedConfig]:
+        """Awaitable process_all, run in the event loop's default executor.
+
+        Returns the same dict and raises the same ConfigurationError.
+        """
+        raise NotImplementedError
+
+
+class ConfigSnapshot(NamedTuple):
+    """One published config: generation counts successful changing reloads."""
+    generation: int
+    config: ConfigView
+
+
+class ConfigHolder:
+    """Hot-reloadable holder for concurrent readers (see 01-description.md).
+
+    Takes ownership of a processor with its files loaded and publishes its
+    processed config as immutable snapshots.
+    """
+
+    def __init__(self, processor: ConfigurationProcessor):
+        """Build generation 1; raise ConfigurationError if it is invalid."""
+        raise NotImplementedError
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Current snapshot, read without locking."""
+        raise NotImplementedError
+
+    def reload(self) -> ConfigSnapshot:
+        """Rebuild off to the side and publish with one reference swap.
+
+        Returns the current snapshot unchanged if nothing changed. On
+        ConfigurationError the previous snapshot stays published.
+        """
+        raise NotImplementedError
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Batch CLI: process every group of a manifest, one NDJSON line per group.
+
+    python solution.py --schema schema.json --manifest manifest.json
+        [--output out.ndjson] [--workers N] [--chunk-size K] [--emit-config] [--codegen]
+
+    Each line is {"group", "ok", "errors"[, "config"]}, in manifest order.
+    Return 0 if every group is valid, 1 if any failed, 2 on bad arguments or
+    unreadable schema/manifest. See 01-description.md.
+    """
+    raise NotImplementedError
+
+
+if __name__ == "__main__":
+    sys.exit(main())
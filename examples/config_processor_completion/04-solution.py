@@ -1,172 +1,2105 @@
+import argparse
+import codecs
 import json
+import asyncio
 import configparser
+import hashlib
+import io
+import marshal
+import multiprocessing
 import os
-from typing import Any, Dict, List, Tuple
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cached_property, partial
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+
+class ValidationIssue(NamedTuple):
+    path: str
+    code: str
+    value: Any = None
+    bound: Any = None
+
+    @property
+    def message(self) -> str:
+        if self.code == "type":
+            return f"Field '{self.path}' must be {self.bound}, got {type(self.value).__name__}"
+        return _ISSUE_MESSAGES[self.code].format(self.path, self.value, self.bound)
+
+    def __str__(self) -> str:
+        return self.message
+
+
+# value holds the measured length for the *_length codes and the expected
+# type name is the bound for "type"
+_ISSUE_MESSAGES: Dict[str, str] = {
+    "missing": "Required field '{0}' is missing",
+    "min_value": "Field '{0}' value {1} is below minimum {2}",
+    "max_value": "Field '{0}' value {1} is above maximum {2}",
+    "min_length": "Field '{0}' length {1} is below minimum {2}",
+    "max_length": "Field '{0}' length {1} is above maximum {2}",
+    "allowed_values": "Field '{0}' value '{1}' not in allowed values {2}",
+    # JSONL streams: a line that is not a JSON object; bound is the line number
+    "document": "Invalid JSON document on line {2}: {1}",
+}
+
+# ValidationIssue((path, code, value, bound)) without the Python-level __new__
+_issue = partial(tuple.__new__, ValidationIssue)
+
+
+def _render(issues: List[ValidationIssue]) -> List[str]:
+    return [issue.message for issue in issues]
 
 
 class ConfigurationError(Exception):
+    def __init__(self, *args: Any, issues: Iterable[ValidationIssue] = ()):
+        super().__init__(*args)
+        self.issues = list(issues)
+
+    # Raised from validation: the message is only rendered when it is read,
+    # then kept in args, so args[0], str() and repr() always agree. Pickling
+    # carries `issues` in __dict__ and renders again on the other side.
+    @property
+    def args(self) -> Tuple[Any, ...]:
+        args = BaseException.args.__get__(self)
+        if not args and self.issues:
+            args = ("Configuration validation failed: " + "; ".join(_render(self.issues)),)
+            BaseException.args.__set__(self, args)
+        return args
+
+    @args.setter
+    def args(self, value: Tuple[Any, ...]):
+        BaseException.args.__set__(self, value)
+
+    def __str__(self) -> str:
+        self.args  # render into the slot BaseException formats from
+        return super().__str__()
+
+    def __repr__(self) -> str:
+        self.args
+        return super().__repr__()
+
+
+_MISSING = object()
+
+_TRUE_STRINGS = frozenset({"true", "1", "yes", "on"})
+
+_TYPE_CHECKS: Dict[str, tuple] = {
+    "string": (str,),
+    "integer": (int,),
+    "float": (int, float),
+    "boolean": (bool,),
+    "list": (list,),
+    "dict": (dict,),
+}
+
+
+# ---------------- Compiled Schema Plans ----------------
+
+class _FieldPlan:
+    __slots__ = (
+        "name", "path", "rule", "required", "type_name", "types",
+        "min_value", "max_value", "min_length", "max_length", "allowed",
+        "allowed_hashed", "allowed_rest", "has_checks", "convert", "nested", "index",
+    )
+
+    def __init__(self, name: Any, path: str, rule: dict):
+        typ = rule.get("type")
+        self.name = name
+        self.path = path
+        self.rule = rule
+        self.required = bool(rule.get("required"))
+        self.type_name = typ
+        self.types = _TYPE_CHECKS.get(typ)
+        self.min_value = rule.get("min_value", _MISSING)
+        self.max_value = rule.get("max_value", _MISSING)
+        self.min_length = rule.get("min_length", _MISSING)
+        self.max_length = rule.get("max_length", _MISSING)
+        self.allowed = rule.get("allowed_values", _MISSING)
+        self.allowed_hashed, self.allowed_rest = _hash_allowed(self.allowed)
+        self.has_checks = any(
+            key in rule for key in ("min_value", "max_value", "min_length", "max_length", "allowed_values")
+        )
+        self.convert = _compile_convert(rule)
+        # filled in by _compile_schema
+        self.nested = None
+        self.index = None
+
+
+# Below this size a list scan beats the hashed lookup and its TypeError guard.
+_ALLOWED_HASH_MIN = 8
+
+
+def _hash_allowed(allowed: Any) -> Tuple[Optional[frozenset], Tuple[Any, ...]]:
+    # Membership index for an allowed_values list: the hashable members as a
+    # frozenset plus the unhashable ones, which can only be scanned. The list
+    # itself stays on the plan for the error message and for unhashable
+    # values, where `value in list` is the only exact answer.
+    if not isinstance(allowed, (list, tuple)) or len(allowed) < _ALLOWED_HASH_MIN:
+        return None, ()
+    hashed = set()
+    rest = []
+    for item in allowed:
+        try:
+            hashed.add(item)
+        except TypeError:
+            rest.append(item)
+    return frozenset(hashed), tuple(rest)
+
+
+_STRING_TRANSFORMS: Dict[str, Callable[[str], str]] = {
+    "uppercase": str.upper,
+    "lowercase": str.lower,
+    "strip": str.strip,
+}
+
+_NUMBER_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "integer": int,
+    "float": float,
+}
+
+
+def _compile_convert(rule: dict) -> Optional[Callable[[Any], Any]]:
+    # Specialized equivalent of ConfigurationProcessor._transform_field for a
+    # non-nested value; None when the field's values pass through unchanged.
+    typ = rule.get("type")
+    transform = rule.get("transform")
+    string_op = _STRING_TRANSFORMS.get(transform) if transform else None
+    use_abs = transform == "abs"
+    finish = None
+    if string_op is not None:
+        def finish(value: Any) -> Any:
+            return string_op(value) if isinstance(value, str) else value
+    elif use_abs:
+        def finish(value: Any) -> Any:
+            return abs(value) if isinstance(value, (int, float)) else value
+
+    parse = _NUMBER_PARSERS.get(typ)
+    if parse is not None:
+        def convert(value: Any) -> Any:
+            if isinstance(value, str):
+                stripped = value.strip()
+                if stripped:
+                    try:
+                        return parse(stripped)
+                    except Exception:
+                        pass
+            return value if finish is None else finish(value)
+    elif typ == "boolean":
+        def convert(value: Any) -> Any:
+            if isinstance(value, str):
+                return value.strip().lower() in _TRUE_STRINGS
+            return value if finish is None else finish(value)
+    elif typ == "string":
+        def convert(value: Any) -> Any:
+            if not isinstance(value, str):
+                value = str(value)
+            return value if string_op is None else string_op(value)
+    else:
+        convert = finish
+    return convert
+
+
+def _compile_schema(schema: dict, prefix: str = "") -> Tuple[_FieldPlan, ...]:
+    # Explicit stack rather than recursion: machine-generated schemas can nest
+    # deeper than the interpreter's recursion limit.
+    def level(schema: dict, prefix: str) -> Tuple[_FieldPlan, ...]:
+        plan = tuple(
+            _FieldPlan(field, f"{prefix}.{field}" if prefix else field, rule)
+            for field, rule in schema.items()
+        )
+        pending.extend(fp for fp in plan if fp.type_name == "dict" and "nested_schema" in fp.rule)
+        return plan
+
+    pending: List[_FieldPlan] = []
+    root = level(schema, prefix)
+    while pending:
+        fp = pending.pop()
+        fp.nested = level(fp.rule["nested_schema"], fp.path)
+        fp.index = {child.name: child for child in fp.nested}
+    return root
+
+
+def _plan_order(plan: Tuple[_FieldPlan, ...]) -> List[_FieldPlan]:
+    # every field plan in validation (depth-first, pre-order) order
+    out: List[_FieldPlan] = []
+    stack = [iter(plan)]
+    while stack:
+        for fp in stack[-1]:
+            out.append(fp)
+            if fp.nested is not None:
+                stack.append(iter(fp.nested))
+                break
+        else:
+            stack.pop()
+    return out
+
+
+def _schema_fingerprint(schema: dict) -> str:
+    # Plain-data schemas hash their marshal encoding: version 0 writes neither
+    # refs nor interned flags, so equal schemas give equal bytes in any
+    # process (snapshots compare fingerprints across processes).
+    try:
+        return hashlib.sha256(b"marshal\0" + marshal.dumps(schema, 0)).hexdigest()
+    except ValueError:
+        pass
+    # anything else (or too deep for marshal): sha256 over a repr-like token
+    # stream, built without recursion so deeply nested schemas work too
+    digest = hashlib.sha256()
+    stack: List[Any] = [schema]
+    while stack:
+        node = stack.pop()
+        if type(node) is _FingerprintMark:
+            digest.update(node)
+        elif isinstance(node, dict):
+            digest.update(b"{")
+            stack.append(_FingerprintMark(b"}"))
+            for key, value in reversed(node.items()):
+                stack.append(value)
+                stack.append(_FingerprintMark(repr(key).encode("utf-8", "backslashreplace") + b":"))
+        elif isinstance(node, (list, tuple)):
+            digest.update(b"[" if isinstance(node, list) else b"(")
+            stack.append(_FingerprintMark(b"]" if isinstance(node, list) else b")"))
+            stack.extend(reversed(node))
+        else:
+            digest.update(repr(node).encode("utf-8", "backslashreplace") + b",")
+    return digest.hexdigest()
+
+
+class _FingerprintMark(bytes):
     pass
 
 
+# compiled plans are shared by every processor built from an equal schema,
+# bounded LRU-style like the result cache
+_PLAN_CACHE_SIZE = 64
+_PLAN_CACHE: "OrderedDict[str, Tuple[_FieldPlan, ...]]" = OrderedDict()
+
+
+def _lru_get(cache: "OrderedDict[Any, Any]", key: Any) -> Any:
+    value = cache.get(key)
+    if value is not None:
+        try:
+            cache.move_to_end(key)
+        except KeyError:
+            pass  # evicted by another thread in between
+    return value
+
+
+def _lru_put(cache: "OrderedDict[Any, Any]", key: Any, value: Any, max_entries: int):
+    cache[key] = value
+    while len(cache) > max_entries:
+        try:
+            cache.popitem(last=False)
+        except KeyError:
+            break
+
+
+def _compiled_plan(schema: dict, fingerprint: str) -> Tuple[_FieldPlan, ...]:
+    plan = _lru_get(_PLAN_CACHE, fingerprint)
+    if plan is None:
+        plan = _compile_schema(schema)
+        _lru_put(_PLAN_CACHE, fingerprint, plan, _PLAN_CACHE_SIZE)
+    return plan
+
+
+# ---------------- Generated Validators ----------------
+
+_CODEGEN_INLINE_DEPTH = 16
+_CODEGEN_CACHE_SIZE = 64
+_CODEGEN_CACHE: "OrderedDict[str, Callable[[dict, List[ValidationIssue]], None]]" = OrderedDict()
+
+
+class _ValidatorCodegen:
+    def __init__(self):
+        self.namespace: Dict[str, Any] = {"_MISSING": _MISSING, "_issue": _issue}
+        self.functions: List[List[str]] = []
+        self.queue: List[Tuple[List[str], Tuple[_FieldPlan, ...]]] = []
+
+    def const(self, value: Any) -> str:
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def function(self, plan: Tuple[_FieldPlan, ...]) -> str:
+        # the body is emitted later by build(), so schemas nested past the
+        # inline depth don't turn into deep emitter recursion
+        name = f"_validate_{len(self.functions)}"
+        lines: List[str] = [f"def {name}(data, errors):"]
+        self.functions.append(lines)
+        self.queue.append((lines, plan))
+        return name
+
+    def emit_plan(self, lines: List[str], plan: Tuple[_FieldPlan, ...], d: str, depth: int, indent: str):
+        v = f"v{depth}"
+        if not plan:
+            lines.append(f"{indent}pass")
+            return
+        for fp in plan:
+            lines.append(f"{indent}{v} = {d}.get({self.const(fp.name)}, _MISSING)")
+            path = self.const(fp.path)
+            if fp.required:
+                lines.append(f"{indent}if {v} is _MISSING:")
+                lines.append(f"{indent}    errors.append(_issue(({path}, 'missing', None, None)))")
+                lines.append(f"{indent}else:")
+            else:
+                lines.append(f"{indent}if {v} is not _MISSING:")
+            body = indent + "    "
+            if fp.types is not None:
+                types = self.const(fp.types)
+                type_name = self.const(fp.type_name)
+                lines.append(f"{body}if not isinstance({v}, {types}):")
+                lines.append(f"{body}    errors.append(_issue(({path}, 'type', {v}, {type_name})))")
+                lines.append(f"{body}else:")
+                body += "    "
+            start = len(lines)
+            self.emit_checks(lines, fp, v, path, body)
+            if fp.nested is not None:
+                if depth + 1 < _CODEGEN_INLINE_DEPTH:
+                    self.emit_plan(lines, fp.nested, v, depth + 1, body)
+                else:
+                    lines.append(f"{body}{self.function(fp.nested)}({v}, errors)")
+            if len(lines) == start:
+                lines.append(f"{body}pass")
+
+    def emit_checks(self, lines: List[str], fp: _FieldPlan, v: str, path: str, indent: str):
+        numeric = fp.type_name in ("integer", "float", "boolean")
+        sized = fp.type_name in ("string", "list")
+        generic = fp.types is None
+        if (numeric or generic) and (fp.min_value is not _MISSING or fp.max_value is not _MISSING):
+            inner = indent
+            if generic:
+                lines.append(f"{indent}if isinstance({v}, (int, float)):")
+                inner += "    "
+            if fp.min_value is not _MISSING:
+                bound = self.const(fp.min_value)
+                lines.append(f"{inner}if {v} < {bound}:")
+                lines.append(f"{inner}    errors.append(_issue(({path}, 'min_value', {v}, {bound})))")
+            if fp.max_value is not _MISSING:
+                bound = self.const(fp.max_value)
+                lines.append(f"{inner}if {v} > {bound}:")
+                lines.append(f"{inner}    errors.append(_issue(({path}, 'max_value', {v}, {bound})))")
+        if (sized or generic) and (fp.min_length is not _MISSING or fp.max_length is not _MISSING):
+            inner = indent
+            if generic:
+                keyword = "elif" if fp.min_value is not _MISSING or fp.max_value is not _MISSING else "if"
+                lines.append(f"{indent}{keyword} isinstance({v}, (str, list)):")
+                inner += "    "
+            if fp.min_length is not _MISSING:
+                bound = self.const(fp.min_length)
+                lines.append(f"{inner}if len({v}) < {bound}:")
+                lines.append(f"{inner}    errors.append(_issue(({path}, 'min_length', len({v}), {bound})))")
+            if fp.max_length is not _MISSING:
+                bound = self.const(fp.max_length)
+                lines.append(f"{inner}if len({v}) > {bound}:")
+                lines.append(f"{inner}    errors.append(_issue(({path}, 'max_length', len({v}), {bound})))")
+        if fp.allowed is not _MISSING:
+            allowed = self.const(fp.allowed)
+            if fp.allowed_hashed is None:
+                lines.append(f"{indent}if {v} not in {allowed}:")
+            else:
+                hashed = self.const(fp.allowed_hashed)
+                test = f"{v} in {hashed}"
+                if fp.allowed_rest:
+                    test += f" or {v} in {self.const(fp.allowed_rest)}"
+                lines.append(f"{indent}try:")
+                lines.append(f"{indent}    hit = {test}")
+                lines.append(f"{indent}except TypeError:")
+                lines.append(f"{indent}    hit = {v} in {allowed}")
+                lines.append(f"{indent}if not hit:")
+            lines.append(f"{indent}    errors.append(_issue(({path}, 'allowed_values', {v}, {allowed})))")
+
+    def build(self, plan: Tuple[_FieldPlan, ...], fingerprint: str) -> Callable[[dict, List[ValidationIssue]], None]:
+        entry = self.function(plan)
+        while self.queue:
+            lines, body = self.queue.pop()
+            self.emit_plan(lines, body, "data", depth=0, indent="    ")
+        source = "\n\n".join("\n".join(lines) for lines in reversed(self.functions)) + "\n"
+        exec(compile(source, f"<config-validator {fingerprint[:12]}>", "exec"), self.namespace)
+        return self.namespace[entry]
+
+
+def _generated_validator(
+    fingerprint: str, plan: Tuple[_FieldPlan, ...],
+) -> Callable[[dict, List[ValidationIssue]], None]:
+    validator = _lru_get(_CODEGEN_CACHE, fingerprint)
+    if validator is None:
+        validator = _ValidatorCodegen().build(plan, fingerprint)
+        _lru_put(_CODEGEN_CACHE, fingerprint, validator, _CODEGEN_CACHE_SIZE)
+    return validator
+
+
+# ---------------- Error Budgets ----------------
+
+class _ErrorBudgetSpent(Exception):
+    pass
+
+
+class _ErrorBudget(list):
+    # Error list for validate_configuration(max_errors=K): the K-th append
+    # unwinds the validator, so no later check runs or formats a message.
+    __slots__ = ("limit",)
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+
+    def append(self, issue: ValidationIssue):
+        list.append(self, issue)
+        if len(self) >= self.limit:
+            raise _ErrorBudgetSpent
+
+
+# ---------------- Layered Merge ----------------
+
+class _MergeGroup(list):
+    pass
+
+
+def _group_layers(layers: List[dict]) -> dict:
+    # Copy the first layer, then walk the others once: non-dict values replace,
+    # dict values meeting another dict are collected into a _MergeGroup so they
+    # are merged only where two or more layers actually overlap.
+    if not layers:
+        return {}
+    pending: Dict[Any, Any] = dict(layers[0])
+    for layer in layers[1:]:
+        for k, v in layer.items():
+            if isinstance(v, dict):
+                prev = pending.get(k)
+                if type(prev) is _MergeGroup:
+                    prev.append(v)
+                    continue
+                if isinstance(prev, dict):
+                    pending[k] = _MergeGroup((prev, v))
+                    continue
+            pending[k] = v
+    return pending
+
+
+def _resolve(value: Any) -> Any:
+    return _merge_layers(value) if type(value) is _MergeGroup else value
+
+
+def _merge_layers(layers: List[dict]) -> dict:
+    # Same result as deep-merging the layers left to right, but subtrees that
+    # only one layer contributes are shared instead of copied. Overlapping
+    # subtrees are resolved from an explicit stack, not by recursion.
+    root = _group_layers(layers)
+    stack = [root]
+    while stack:
+        pending = stack.pop()
+        for k, v in pending.items():
+            if type(v) is _MergeGroup:
+                child = _group_layers(v)
+                pending[k] = child
+                stack.append(child)
+    return root
+
+
+class _FuseFrame:
+    # one level of ConfigurationProcessor._fuse in progress
+    __slots__ = ("pending", "fields", "schema", "out", "errors", "owner", "start")
+
+    def __init__(
+        self, layers: List[dict], plan: Tuple[_FieldPlan, ...], schema: dict,
+        errors: List[ValidationIssue], owner: Optional[_FieldPlan], start: int,
+    ):
+        self.pending = layers[0] if len(layers) == 1 else _group_layers(layers)
+        self.fields = iter(plan)
+        self.schema = schema
+        self.out: Dict[str, Any] = {}
+        self.errors = errors
+        self.owner = owner
+        self.start = start  # first leaf of this level in the path index
+
+
+# ---------------- Source Tracking ----------------
+
+class _SourceFile:
+    __slots__ = ("path", "file_format", "digest", "tree")
+
+    def __init__(self, path: str, file_format: str, digest: str, tree: dict):
+        self.path = path
+        self.file_format = file_format
+        self.digest = digest
+        self.tree = tree
+
+
+def _content_digest(raw: bytes) -> str:
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _file_digest(filepath: str) -> str:
+    # _content_digest of the file's bytes without holding them all
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(_STREAM_CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _decode(raw: bytes) -> str:
+    # same text as open(..., 'r', encoding='utf-8') with universal newlines
+    text = raw.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+# ---------------- File Parsing ----------------
+
+# documents larger than this are parsed on a process pool by load_config_files
+_PROCESS_PARSE_BYTES = 256 * 1024
+
+
+def _parse_document(content: str, file_format: str) -> Optional[dict]:
+    if file_format == "json":
+        try:
+            config = json.loads(content)
+        except RecursionError:
+            # nested deeper than json's C scanner allows: the streaming reader
+            # builds the same tree from an explicit stack
+            config = _JSONStreamReader(io.BytesIO(content.encode("utf-8"))).parse()
+        return config if isinstance(config, dict) else None
+    if file_format == "ini":
+        return _parse_ini(content)
+    return None
+
+
+def _parse_ini(content: str) -> dict:
+    config = _scan_ini(content)
+    return config if config is not None else _parse_ini_configparser(content)
+
+
+def _scan_ini(content: str) -> Optional[dict]:
+    # Single-pass tokenizer for the subset where it provably matches
+    # ConfigParser().read_string + items(): unindented `key = value` / `key: value`
+    # lines, `[section]` headers and full-line `#`/`;` comments. Anything else
+    # (continuation lines, DEFAULT, `%` interpolation, duplicates, malformed
+    # lines) returns None so configparser produces the result or the error.
+    result: Dict[str, dict] = {}
+    section = None
+    for line in content.split("\n"):
+        text = line.strip()
+        if not text or text[0] == "#" or text[0] == ";":
+            continue
+        if line[0] != text[0]:
+            return None
+        if text[0] == "[":
+            end = text.rfind("]")
+            if end < 2:
+                return None
+            name = text[1:end]
+            if name in result or name == "DEFAULT":
+                return None
+            section = result[name] = {}
+            continue
+        if section is None:
+            return None
+        split = text.find("=")
+        colon = text.find(":", 0, split if split >= 0 else len(text))
+        if colon >= 0:
+            split = colon
+        if split <= 0:
+            return None
+        key = text[:split].rstrip().lower()
+        value = text[split + 1:].strip()
+        if key in section or "%" in value:
+            return None
+        section[key] = _parse_ini_value(value)
+    return result
+
+
+def _parse_ini_configparser(content: str) -> dict:
+    parser = configparser.ConfigParser()
+    parser.read_string(content)
+    result: Dict[str, dict] = {}
+    for section_name in parser.sections():
+        section: Dict[str, Any] = {}
+        for key, value in parser.items(section_name):
+            section[key] = _parse_ini_value(value)
+        result[section_name] = section
+    return result
+
+
+def _parse_ini_value(value: str) -> Any:
+    v = value.strip()
+    low = v.lower()
+    if low in {"true", "yes", "on", "1"}:
+        return True
+    if low in {"false", "no", "off", "0"}:
+        return False
+    try:
+        if "." in v or "e" in v or "E" in v:
+            return float(v)
+        return int(v)
+    except ValueError:
+        return v
+
+
+# ---------------- Streaming JSON ----------------
+
+_STREAM_CHUNK_BYTES = 1 << 16
+_JSON_WS = re.compile(r"[ \t\n\r]*")
+_JSON_TOKEN_END = re.compile(r"[ \t\n\r,:\]}]")
+_BATCH_ATTEMPTS = 3
+# after the C scanner hits the recursion limit, this many containers are
+# opened on the explicit stack before it is tried again
+_DEEP_OPENS = 256
+_OPEN = object()
+_BATCHED = object()
+
+
+class _JSONStreamReader:
+    # Builds the same tree as json.load(f) from fixed-size chunks. Each value is
+    # first handed to json's C scanner; a container that runs past the buffered
+    # text is opened on an explicit stack. Once per chunk an open container also
+    # tries to scan all of its buffered members in one call (wrapped up to the
+    # last comma); otherwise members are scanned one by one. Only about one
+    # chunk of text is held at a time, and since json's key memo lives for one
+    # scanner call, batching also keeps repeated object keys shared.
+
+    def __init__(self, f, chunk_size: int = _STREAM_CHUNK_BYTES):
+        self.scan = json.scanner.make_scanner(json.JSONDecoder())
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.hasher = hashlib.blake2b(digest_size=16)
+        self.buf = ""
+        self.pos = 0
+        self.fills = 0
+        self.eof = False
+        self.deep_opens = 0
+
+    def digest(self) -> str:
+        return self.hasher.hexdigest()
+
+    def parse(self) -> Any:
+        stack: List[list] = []  # [container, closing char, pending key, fill of last failed batch]
+        value = self._value(stack)
+        while True:
+            if value is _OPEN:
+                frame = stack[-1]
+                c = self._next()
+                if c == frame[1]:
+                    self.pos += 1
+                    value = stack.pop()[0]
+                else:
+                    value = self._member(frame, stack, c)
+                    continue
+            if not stack:
+                break
+            frame = stack[-1]
+            if value is not _BATCHED:
+                if frame[1] == "}":
+                    frame[0][frame[2]] = value
+                else:
+                    frame[0].append(value)
+            c = self._next()
+            if c == ",":
+                self.pos += 1
+                value = self._member(frame, stack, self._next())
+            elif c == frame[1]:
+                self.pos += 1
+                value = stack.pop()[0]
+            else:
+                raise ValueError(f"Expecting ',' delimiter at offset {self.pos}")
+        if self._next():
+            raise ValueError(f"Extra data at offset {self.pos}")
+        return value
+
+    def _fill(self) -> bool:
+        while not self.eof:
+            raw = self.f.read(self.chunk_size)
+            self.hasher.update(raw)
+            self.eof = not raw
+            text = self.decoder.decode(raw, final=self.eof)
+            if text:
+                self.buf = self.buf[self.pos:] + text
+                self.pos = 0
+                self.fills += 1
+                return True
+        return False
+
+    def _next(self) -> str:
+        # skip whitespace; the next character, or "" at the end of the document
+        while True:
+            self.pos = _JSON_WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def _member(self, frame: list, stack: List[list], c: str) -> Any:
+        # c == closer here can only be a trailing comma: leave that error to _value.
+        # Inside a very deep document batches would only hit the recursion limit.
+        if frame[3] != self.fills and c != frame[1] and not self.deep_opens:
+            value = self._batch(frame, stack)
+            if value is not _MISSING:
+                return value
+            frame[3] = self.fills
+        if frame[1] == "}":
+            frame[2] = self._key(c)
+        return self._value(stack)
+
+    def _batch(self, frame: list, stack: List[list]) -> Any:
+        # Scan "[" + members up to a buffered comma + "]" in one call. A comma
+        # inside a string or a nested container leaves that wrapper unbalanced,
+        # so the scan fails rather than mis-parsing; if the scan stops early it
+        # stopped at this container's own closing bracket. Cuts tried: the last
+        # comma, then the last commas that directly follow a nested container.
+        buf = self.buf
+        start = self.pos
+        closer = frame[1]
+        opener = "{" if closer == "}" else "["
+        cut = buf.rfind(",", start)
+        for _ in range(_BATCH_ATTEMPTS):
+            if cut <= start:
+                break
+            text = opener + buf[start:cut] + closer
+            try:
+                value, end = self.scan(text, 0)
+            except (StopIteration, ValueError):
+                cut = max(buf.rfind("},", start, cut), buf.rfind("],", start, cut)) + 1
+                continue
+            except RecursionError:
+                self.deep_opens = _DEEP_OPENS
+                break
+            container = frame[0]
+            if closer == "}":
+                for key, item in value.items():
+                    container[key] = item
+            else:
+                container.extend(value)
+            if end == len(text):
+                self.pos = cut
+                return _BATCHED
+            self.pos = start + end - 1
+            return stack.pop()[0]
+        return _MISSING
+
+    def _key(self, c: str) -> str:
+        if c != '"':
+            raise ValueError(f"Expecting property name enclosed in double quotes at offset {self.pos}")
+        while True:
+            try:
+                key, end = json.decoder.scanstring(self.buf, self.pos + 1, True)
+                break
+            except json.JSONDecodeError as exc:
+                if not self._truncated_string(exc) or not self._fill():
+                    raise
+        self.pos = end
+        if self._next() != ":":
+            raise ValueError(f"Expecting ':' delimiter at offset {self.pos}")
+        self.pos += 1
+        return key
+
+    def _value(self, stack: List[list]) -> Any:
+        c = self._next()
+        if self.deep_opens and (c == "{" or c == "["):
+            self.deep_opens -= 1
+            return self._open(c, stack)
+        while True:
+            try:
+                value, end = self.scan(self.buf, self.pos)
+            except StopIteration:
+                if c == "{" or c == "[":
+                    return self._open(c, stack)
+                # a number or literal cut by the chunk boundary fails too
+                if _JSON_TOKEN_END.search(self.buf, self.pos) or not self._fill():
+                    raise ValueError(f"Expecting value at offset {self.pos}")
+                continue
+            except json.JSONDecodeError as exc:
+                if c == "{" or c == "[":
+                    return self._open(c, stack)
+                if not self._truncated_string(exc) or not self._fill():
+                    raise
+                continue
+            except RecursionError:
+                # too deep for the C scanner: open this level, and the next
+                # few, on the explicit stack
+                self.deep_opens = _DEEP_OPENS
+                return self._open(c, stack)
+            # "1" may be the head of "1.5" / "1e-3" in the next chunk
+            if len(self.buf) - end < 3 and not self.eof and c not in '"tfn[{' and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _open(self, c: str, stack: List[list]) -> Any:
+        self.pos += 1
+        stack.append([{}, "}", None, -1] if c == "{" else [[], "]", None, -1])
+        return _OPEN
+
+    def _truncated_string(self, exc: json.JSONDecodeError) -> bool:
+        return exc.msg.startswith("Unterminated string") or exc.pos >= len(self.buf) - 6
+
+
+def _stream_json(filepath: str) -> Tuple[Any, str]:
+    with open(filepath, "rb") as f:
+        reader = _JSONStreamReader(f, _STREAM_CHUNK_BYTES)
+        return reader.parse(), reader.digest()
+
+
+def _clean_process_context() -> Any:
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _parse_in_worker(raw: bytes, file_format: str) -> Tuple[Optional[dict], float]:
+    # process-pool entry point: failures come back as None, not as pickled
+    # exceptions; the parse time rides along for instrumented processors
+    start = time.perf_counter()
+    try:
+        tree = _parse_document(_decode(raw), file_format)
+    except Exception:
+        tree = None
+    return tree, time.perf_counter() - start
+
+
+class _PendingLoad:
+    __slots__ = ("path", "file_format", "stat", "raw", "digest", "tree", "cache_hit")
+
+    def __init__(
+        self, path: str, file_format: str, stat: Optional[os.stat_result], raw: Optional[bytes],
+        digest: str, tree: Any, cache_hit: bool,
+    ):
+        self.path = path
+        self.file_format = file_format
+        self.stat = stat
+        self.raw = raw
+        self.digest = digest
+        self.tree = tree
+        self.cache_hit = cache_hit
+
+
+# ---------------- Parsed-file Cache ----------------
+
+_CACHE_VERSION = 1
+_CACHE_SUFFIX = ".cfgcache"
+# an entry's stat is only trusted once the file is this much older than the
+# moment it was cached; younger files may still change within one mtime tick
+_CACHE_RACY_NS = 2_000_000_000
+
+
+class _ParseCache:
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: Optional[Dict[str, Tuple[int, int]]] = None  # name -> (size, last use ns)
+        self._total = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _name(self, filepath: str, file_format: str) -> str:
+        key = f"{file_format}\0{os.path.abspath(filepath)}".encode("utf-8", "surrogatepass")
+        return hashlib.sha256(key).hexdigest() + _CACHE_SUFFIX
+
+    def load(self, filepath: str, file_format: str, stat: os.stat_result) -> Optional[Tuple[str, dict, bool]]:
+        # (digest, tree, trusted) where trusted means size and mtime alone proved it current
+        try:
+            with open(os.path.join(self.directory, self._name(filepath, file_format)), "rb") as f:
+                entry = marshal.load(f)
+            version, path, fmt, size, mtime_ns, cached_ns, digest, tree = entry
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != _CACHE_VERSION or path != os.path.abspath(filepath) or fmt != file_format:
+            return None
+        trusted = (
+            size == stat.st_size and mtime_ns == stat.st_mtime_ns
+            and cached_ns - mtime_ns >= _CACHE_RACY_NS
+        )
+        return digest, tree, trusted
+
+    def store(self, filepath: str, file_format: str, stat: os.stat_result, digest: str, tree: dict):
+        name = self._name(filepath, file_format)
+        entry = (
+            _CACHE_VERSION, os.path.abspath(filepath), file_format,
+            stat.st_size, stat.st_mtime_ns, time.time_ns(), digest, tree,
+        )
+        try:
+            data = marshal.dumps(entry)
+        except ValueError:
+            return
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, os.path.join(self.directory, name))
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            return
+        self._account(name, len(data))
+        self._evict()
+
+    def touch(self, filepath: str, file_format: str):
+        name = self._name(filepath, file_format)
+        try:
+            os.utime(os.path.join(self.directory, name))
+        except OSError:
+            return
+        if self._entries is not None and name in self._entries:
+            self._entries[name] = (self._entries[name][0], time.time_ns())
+
+    def _account(self, name: str, size: int):
+        if self._entries is None:
+            self._scan()
+        previous = self._entries.get(name)
+        if previous is not None:
+            self._total -= previous[0]
+        self._entries[name] = (size, time.time_ns())
+        self._total += size
+
+    def _scan(self):
+        self._entries = {}
+        self._total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for item in it:
+                    if item.name.endswith(_CACHE_SUFFIX):
+                        st = item.stat()
+                        self._entries[item.name] = (st.st_size, st.st_mtime_ns)
+                        self._total += st.st_size
+        except OSError:
+            pass
+
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+        # other processes may share the directory: resync before choosing victims
+        self._scan()
+        for name in sorted(self._entries, key=lambda n: self._entries[n][1]):
+            if self._total <= self.max_bytes:
+                break
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            self._total -= self._entries.pop(name)[0]
+
+
+# ---------------- Binary Snapshots ----------------
+
+_SNAPSHOT_MAGIC = b"CFGSNAP\n"
+_SNAPSHOT_VERSION = 1
+
+
+def _read_snapshot(path: str) -> Tuple[Tuple[Any, ...], BinaryIO]:
+    # (header, file positioned at the payload); the payload is only read once
+    # the header has proved the snapshot current. The header is length-prefixed
+    # because marshal.load on a file is far slower than marshal.loads on bytes.
+    f = open(path, "rb")
+    try:
+        if f.read(len(_SNAPSHOT_MAGIC)) != _SNAPSHOT_MAGIC:
+            raise ValueError("bad magic")
+        size = int.from_bytes(f.read(4), "little")
+        header = marshal.loads(f.read(size))
+        version, fingerprint, written_ns, sources = header
+        if version != _SNAPSHOT_VERSION:
+            raise ValueError("unsupported version")
+    except BaseException:
+        f.close()
+        raise
+    return header, f
+
+
+def _stale_source(sources: Tuple[Tuple[Any, ...], ...], written_ns: int) -> Optional[str]:
+    # path of the first source whose content no longer matches, else None.
+    # Like the parse cache, size + mtime are trusted when the file was already
+    # settled when the snapshot was written; otherwise the file is hashed.
+    for path, _, size, mtime_ns, digest in sources:
+        try:
+            st = os.stat(path)
+            if st.st_size == size and st.st_mtime_ns == mtime_ns and written_ns - mtime_ns >= _CACHE_RACY_NS:
+                continue
+            if st.st_size == size and _file_digest(path) == digest:
+                continue
+        except OSError:
+            pass
+        return path
+    return None
+
+
+# ---------------- Result Cache ----------------
+
+# marshal format 2 writes no back-references, so equal trees always encode
+# to the same bytes regardless of object sharing or interning
+_FINGERPRINT_MARSHAL_VERSION = 2
+
+
+class ResultCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    max_entries: int
+    entries: int
+
+
+class _ResultCache:
+    # LRU of process_all outcomes: key -> (result, issues), result None on failure
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, Tuple[Optional[dict], Tuple[ValidationIssue, ...]]]" = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[Tuple[Optional[dict], Tuple[ValidationIssue, ...]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple, entry: Tuple[Optional[dict], Tuple[ValidationIssue, ...]]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def info(self) -> ResultCacheInfo:
+        return ResultCacheInfo(self.hits, self.misses, self.max_entries, len(self._entries))
+
+
+def _layer_blobs(layers: List[dict]) -> Optional[List[bytes]]:
+    # None when a layer holds something marshal can't encode (or nests too deep)
+    try:
+        return [marshal.dumps(layer, _FINGERPRINT_MARSHAL_VERSION) for layer in layers]
+    except ValueError:
+        return None
+
+
+# ---------------- Instrumentation ----------------
+
+_STAGES = ("read", "parse_json", "parse_ini", "merge", "transform", "validate", "process", "reload", "tenant")
+_PARSE_STAGES = {"json": "parse_json", "ini": "parse_ini"}
+
+
+class StageEvent(NamedTuple):
+    stage: str
+    seconds: float
+    bytes_read: int = 0
+    keys_visited: int = 0
+    errors: int = 0
+    calls: int = 1
+
+
+class StageStats(NamedTuple):
+    calls: int = 0
+    seconds: float = 0.0
+    bytes_read: int = 0
+    keys_visited: int = 0
+    errors: int = 0
+
+
+class ProcessorStats(NamedTuple):
+    stages: Dict[str, StageStats]
+    callback_errors: int
+
+
+class _StageRecorder:
+    # Shared by loader threads, hence the lock. Only exists when instrumentation
+    # is on: the disabled cost is one `self._stats is None` test per stage.
+    def __init__(self, callback: Optional[Callable[[StageEvent], None]]):
+        self.callback = callback
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._totals = {stage: [0, 0.0, 0, 0, 0] for stage in _STAGES}
+            self._callback_errors = 0
+
+    def record(self, event: StageEvent):
+        with self._lock:
+            totals = self._totals[event.stage]
+            totals[0] += event.calls
+            totals[1] += event.seconds
+            totals[2] += event.bytes_read
+            totals[3] += event.keys_visited
+            totals[4] += event.errors
+        if self.callback is not None:
+            try:
+                self.callback(event)
+            except Exception:
+                # a broken exporter must not fail loads or validation
+                with self._lock:
+                    self._callback_errors += 1
+
+    def snapshot(self) -> ProcessorStats:
+        with self._lock:
+            stages = {stage: StageStats(*totals) for stage, totals in self._totals.items()}
+            return ProcessorStats(stages, self._callback_errors)
+
+
+def _count_keys(tree: Any) -> int:
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            count += len(node)
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return count
+
+
+# ---------------- Incremental State ----------------
+
+class _IncrementalState:
+    __slots__ = ("layers", "merged", "result", "store")
+
+    def __init__(self, layers: List[dict], merged: dict, result: dict, store: Dict[_FieldPlan, List[ValidationIssue]]):
+        self.layers = layers
+        self.merged = merged
+        self.result = result
+        self.store = store
+
+
+class _OverlayFrame:
+    # one level of ConfigurationProcessor._apply_overlay in progress
+    __slots__ = ("merged", "items", "out", "plan", "index", "owner", "parent", "key", "reorder")
+
+    def __init__(
+        self, merged: dict, overlay: dict, out: dict, plan: Tuple[_FieldPlan, ...],
+        index: Dict[Any, _FieldPlan], owner: Optional[_FieldPlan], parent: Optional[dict], key: Any,
+    ):
+        self.merged = merged  # the base's merged level
+        self.items = iter(overlay.items())
+        self.out = out  # copy of the base's output level, updated in place
+        self.plan = plan
+        self.index = index
+        self.owner = owner
+        self.parent = parent
+        self.key = key
+        self.reorder = False  # a schema field appeared: restore schema order
+
+
+def _effective(layers: List[dict], key: Any) -> Tuple[Optional[List[dict]], Any]:
+    # (dict layers that merge at key, or None) and the winning non-dict value
+    group = None
+    value = _MISSING
+    for layer in layers:
+        v = layer.get(key, _MISSING)
+        if v is _MISSING:
+            continue
+        if isinstance(v, dict):
+            if group is None:
+                group = [v]
+            else:
+                group.append(v)
+        else:
+            group = None
+            value = v
+    return group, value
+
+
+def _remerge(node: dict, layers: List[dict], path: Tuple[Any, ...]) -> dict:
+    # Path-copy of the merged tree `node` with `path` re-resolved from `layers`;
+    # siblings off the path stay shared. Descends first, then copies upwards.
+    above: List[Tuple[dict, Any]] = []
+    while True:
+        key = path[0]
+        group, value = _effective(layers, key)
+        if group is not None and len(path) > 1 and isinstance(node.get(key), dict):
+            above.append((node, key))
+            node, layers, path = node[key], group, path[1:]
+            continue
+        if group is None:
+            child = value
+        else:
+            child = group[0] if len(group) == 1 else _merge_layers(group)
+        break
+    if len(path) > 1:
+        out = dict(node)
+        out[key] = child
+    else:
+        # the key itself was added, removed or replaced in some layer, which can
+        # move its first appearance: rebuild this level in first-appearance order
+        out = {}
+        for layer in layers:
+            for k in layer:
+                if k not in out:
+                    v = child if k == key else node.get(k, _MISSING)
+                    if v is not _MISSING:
+                        out[k] = v
+    for parent, key in reversed(above):
+        child, out = out, dict(parent)
+        out[key] = child
+    return out
+
+
+def _get_in(node: Any, path: Tuple[Any, ...]) -> Any:
+    for key in path:
+        if not isinstance(node, dict):
+            return _MISSING
+        node = node.get(key, _MISSING)
+    return node
+
+
+def _key_order(node: Any) -> Optional[List[Any]]:
+    return list(node) if isinstance(node, dict) else None
+
+
+def _same(a: Any, b: Any) -> bool:
+    # type-, order- and structure-exact equality, without recursion
+    stack = [(a, b)]
+    while stack:
+        a, b = stack.pop()
+        if type(a) is not type(b):
+            return False
+        if isinstance(a, dict):
+            if list(a) != list(b):
+                return False
+            stack.extend((v, b[k]) for k, v in a.items())
+        elif isinstance(a, list):
+            if len(a) != len(b):
+                return False
+            stack.extend(zip(a, b))
+        elif a != b:
+            return False
+    return True
+
+
+def _diff_paths(old: dict, new: dict, prefix: Tuple[Any, ...], out: List[Tuple[Any, ...]]):
+    # pre-order like a recursive walk: a nested level's paths come before the
+    # later keys of its parent
+    if old.keys() == new.keys() and list(old) != list(new):
+        # same keys, new order: the whole level may merge in a different order
+        out.append(prefix)
+        return
+    stack = [(old, new, prefix, iter(new.items()))]
+    while stack:
+        old, new, prefix, items = stack[-1]
+        if items is None:
+            stack.pop()
+            for key in old:
+                if key not in new:
+                    out.append(prefix + (key,))
+            continue
+        for key, value in items:
+            before = old.get(key, _MISSING)
+            if isinstance(before, dict) and isinstance(value, dict):
+                if before.keys() == value.keys() and list(before) != list(value):
+                    # same keys, new order: the whole level may merge in a different order
+                    out.append(prefix + (key,))
+                    continue
+                stack.append((before, value, prefix + (key,), iter(value.items())))
+                break
+            if before is _MISSING or not _same(before, value):
+                out.append(prefix + (key,))
+        else:
+            stack[-1] = (old, new, prefix, None)
+
+
+def _dotted(path: Tuple[Any, ...]) -> str:
+    return ".".join(str(key) for key in path)
+
+
+# ---------------- Read-only Views ----------------
+
+class ConfigView(Mapping):
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getitem__(self, key: Any) -> Any:
+        return _freeze(self._data[key])
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ConfigView):
+            return self._data == other._data
+        if isinstance(other, dict):
+            return self._data == other
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ConfigView({self._data!r})"
+
+    def to_dict(self) -> dict:
+        return _thaw(self._data)
+
+
+class ConfigListView(Sequence):
+    __slots__ = ("_data",)
+
+    def __init__(self, data: list):
+        self._data = data
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return ConfigListView(self._data[index])
+        return _freeze(self._data[index])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ConfigListView):
+            return self._data == other._data
+        if isinstance(other, list):
+            return self._data == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ConfigListView({self._data!r})"
+
+    def to_list(self) -> list:
+        return _thaw(self._data)
+
+
+class _PathIndex:
+    # Flat index of a processed config, filled in while it is being built.
+    # Leaves (non-dict values) are recorded in pre-order, so the leaves under any
+    # dict form one contiguous slice of `leaves`; `ranges` holds that slice.
+    __slots__ = ("paths", "leaves", "ranges")
+
+    def __init__(self):
+        self.paths: Dict[str, Any] = {}
+        self.leaves: List[str] = []
+        self.ranges: Dict[str, Tuple[int, int]] = {}
+
+    def close(self, path: str, node: dict, start: int):
+        if path:
+            self.paths[path] = node
+        self.ranges[path] = (start, len(self.leaves))
+
+    def add(self, path: str, value: Any):
+        if not isinstance(value, dict):
+            self.paths[path] = value
+            self.leaves.append(path)
+            return
+        stack = [(path, value, iter(value.items()), len(self.leaves))]
+        while stack:
+            prefix, node, items, start = stack[-1]
+            for k, v in items:
+                child = f"{prefix}.{k}" if prefix else f"{k}"
+                if isinstance(v, dict):
+                    stack.append((child, v, iter(v.items()), len(self.leaves)))
+                    break
+                self.paths[child] = v
+                self.leaves.append(child)
+            else:
+                stack.pop()
+                self.close(prefix, node, start)
+
+
+class IndexedConfig(ConfigView):
+    __slots__ = ("_index",)
+
+    def __init__(self, data: dict, index: _PathIndex):
+        super().__init__(data)
+        self._index = index
+
+    def get(self, path: Any, default: Any = None) -> Any:
+        if not isinstance(path, str):
+            return Mapping.get(self, path, default)
+        value = self._index.paths.get(path, _MISSING)
+        return default if value is _MISSING else _freeze(value)
+
+    def scan(self, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+        if prefix.endswith("*"):
+            prefix = prefix[:-1].rstrip(".")
+        span = self._index.ranges.get(prefix)
+        if span is None:
+            return
+        paths = self._index.paths
+        for path in self._index.leaves[span[0]:span[1]]:
+            yield path, _freeze(paths[path])
+
+    def leaf_paths(self) -> Iterator[str]:
+        return iter(self._index.leaves)
+
+    def __repr__(self) -> str:
+        return f"IndexedConfig({self._data!r})"
+
+
+class LazyConfigView(Mapping):
+    # transform_values(config, lazy=True): each key is coerced/transformed the
+    # first time it is read, from the compiled field plans, and memoized. Nested
+    # schema dicts become child views, so unread subtrees are never touched.
+    __slots__ = ("_source", "_plan", "_index", "_values", "_keys")
+
+    def __init__(self, source: dict, plan: Tuple[_FieldPlan, ...], index: Dict[Any, _FieldPlan]):
+        self._source = source
+        self._plan = plan
+        self._index = index
+        self._values: Dict[Any, Any] = {}
+        self._keys: Optional[Tuple[Any, ...]] = None
+
+    def _value(self, key: Any) -> Any:
+        value = self._values.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        source = self._source
+        fp = self._index.get(key)
+        if fp is None:
+            value = source[key]  # pass-through extra, or KeyError
+        elif key in source:
+            value = source[key]
+            if fp.nested is not None and isinstance(value, dict):
+                value = LazyConfigView(value, fp.nested, fp.index)
+            elif fp.convert is not None:
+                value = fp.convert(value)
+        elif "default" in fp.rule:
+            value = fp.rule["default"]
+        else:
+            raise KeyError(key)
+        self._values[key] = value
+        return value
+
+    def __getitem__(self, key: Any) -> Any:
+        return _freeze(self._value(key))
+
+    def _key_order(self) -> Tuple[Any, ...]:
+        if self._keys is None:
+            # same order as transform_values: schema fields, then extras
+            source = self._source
+            keys = [fp.name for fp in self._plan if fp.name in source or "default" in fp.rule]
+            keys.extend(key for key in source if key not in self._index)
+            self._keys = tuple(keys)
+        return self._keys
+
+    def __iter__(self):
+        return iter(self._key_order())
+
+    def __len__(self) -> int:
+        return len(self._key_order())
+
+    def __contains__(self, key: Any) -> bool:
+        fp = self._index.get(key)
+        if fp is None:
+            return key in self._source
+        return key in self._source or "default" in fp.rule
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyConfigView):
+            other = other.to_dict()
+        elif isinstance(other, ConfigView):
+            other = other._data
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"LazyConfigView({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        # materialize every key into a mutable copy equal to
+        # transform_values(config), memoizing as it goes. Walks the plan
+        # directly instead of going through _value once per key.
+        out: Dict[Any, Any] = {}
+        stack = [(self, out)]
+        while stack:
+            view, target = stack.pop()
+            source, values = view._source, view._values
+            for fp in view._plan:
+                key = fp.name
+                value = values.get(key, _MISSING)
+                if value is _MISSING:
+                    if key in source:
+                        value = source[key]
+                        if fp.nested is not None and isinstance(value, dict):
+                            value = LazyConfigView(value, fp.nested, fp.index)
+                        elif fp.convert is not None:
+                            value = fp.convert(value)
+                    elif "default" in fp.rule:
+                        value = fp.rule["default"]
+                    else:
+                        continue
+                    values[key] = value
+                if type(value) is LazyConfigView:  # exact check skips the ABC hook
+                    child: Dict[Any, Any] = {}
+                    target[key] = child
+                    stack.append((value, child))
+                else:
+                    target[key] = _thaw(value) if isinstance(value, (dict, list)) else value
+            # pass-through extra fields
+            index = view._index
+            if source.keys() - index.keys():
+                for key, value in source.items():
+                    if key not in index:
+                        target[key] = _thaw(value) if isinstance(value, (dict, list)) else value
+        return out
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return ConfigView(value)
+    if isinstance(value, list):
+        return ConfigListView(value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    # deep copy of the dicts and lists, iteratively
+    if not isinstance(value, (dict, list)):
+        return value
+    root = dict(value) if isinstance(value, dict) else list(value)
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for k, v in (node.items() if isinstance(node, dict) else enumerate(node)):
+            if isinstance(v, (dict, list)):
+                v = node[k] = dict(v) if isinstance(v, dict) else list(v)
+                stack.append(v)
+    return root
+
+
+# ---------------- JSONL Streams ----------------
+
+class StreamStats(NamedTuple):
+    documents: int
+    valid: int
+    bytes_read: int
+    seconds: float
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.seconds if self.seconds > 0 else 0.0
+
+
+class JsonlStream:
+    # Iterating runs the pipeline once: the input is read a block at a time
+    # and each line is transformed and validated as it is reached, so memory
+    # stays at one block plus one document. `stats` is live while iterating;
+    # `seconds` is time spent in the pipeline, not in the consumer between
+    # results.
+    def __init__(
+        self, process: Callable[[dict], Tuple[dict, List[ValidationIssue]]],
+        path: str, output: Optional[str], structured: bool,
+    ):
+        self._process = process
+        self._path = path
+        self._output = output
+        self._structured = structured
+        self._counts = [0, 0, 0, 0.0]  # documents, valid, bytes read, seconds
+        self._started = False
+
+    @property
+    def stats(self) -> StreamStats:
+        return StreamStats(*self._counts)
+
+    def __iter__(self) -> Iterator[Tuple[int, bool, Union[List[str], List[ValidationIssue]]]]:
+        if self._started:
+            raise RuntimeError("a JSONL stream can only be iterated once")
+        self._started = True
+        return self._run()
+
+    def _run(self) -> Iterator[Tuple[int, bool, Union[List[str], List[ValidationIssue]]]]:
+        counts = self._counts
+        process = self._process
+        out = open(self._output, "w", encoding="utf-8") if self._output is not None else None
+        try:
+            # the buffered reader fills one block at a time and hands out lines
+            with open(self._path, "rb", buffering=_STREAM_CHUNK_BYTES) as f:
+                began = time.perf_counter()
+                for index, line in enumerate(f):
+                    counts[2] += len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        doc = _parse_document(line.decode("utf-8"), "json")
+                        detail = "not a JSON object"
+                    except ValueError as e:
+                        doc = None
+                        detail = e.msg if isinstance(e, json.JSONDecodeError) else str(e)
+                    if doc is None:
+                        issues = [_issue(("", "document", detail, index + 1))]
+                    else:
+                        result, issues = process(doc)
+                    counts[0] += 1
+                    if not issues:
+                        counts[1] += 1
+                        if out is not None:
+                            out.write(json.dumps(result, default=str))
+                            out.write("\n")
+                    counts[3] += time.perf_counter() - began
+                    yield index, not issues, issues if self._structured else _render(issues)
+                    began = time.perf_counter()
+                counts[3] += time.perf_counter() - began
+        finally:
+            if out is not None:
+                out.close()
+
+
 class ConfigurationProcessor:
-    def __init__(self, schema_definition: dict):
+    def __init__(
+        self,
+        schema_definition: dict,
+        codegen: bool = False,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        json_stream_threshold: Optional[int] = None,
+        result_cache_size: int = 0,
+        instrument: bool = False,
+        on_stage: Optional[Callable[[StageEvent], None]] = None,
+    ):
+        if result_cache_size < 0:
+            raise ValueError("result_cache_size must be >= 0")
         self.schema = schema_definition
         self.configurations: List[dict] = []
+        self._schema_fingerprint = _schema_fingerprint(schema_definition) if result_cache_size else None
+        self._validator = _generated_validator(self._fingerprint(), self._plan) if codegen else None
+        self._sources: Dict[int, _SourceFile] = {}
+        self._incremental: Optional[_IncrementalState] = None
+        self._tenant_base: Optional[_IncrementalState] = None
+        self._cache = _ParseCache(cache_dir, cache_max_bytes) if cache_dir is not None else None
+        self._json_stream_threshold = json_stream_threshold
+        self._results = _ResultCache(result_cache_size) if result_cache_size else None
+        self._stats = _StageRecorder(on_stage) if instrument or on_stage is not None else None
+
+    # The schema is compiled on first use, so a worker that only loads a
+    # snapshot never pays for compiling it, and only once per distinct schema.
+    @cached_property
+    def _plan(self) -> Tuple[_FieldPlan, ...]:
+        return _compiled_plan(self.schema, self._fingerprint())
+
+    @cached_property
+    def _plan_index(self) -> Dict[Any, _FieldPlan]:
+        return {fp.name: fp for fp in self._plan}
+
+    @cached_property
+    def _plan_order(self) -> List[_FieldPlan]:
+        return _plan_order(self._plan)
 
     # ---------------- File Loading ----------------
 
     def load_config_file(self, filepath: str, file_format: str) -> bool:
         try:
-            if not os.path.exists(filepath):
-                return False
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-            if file_format == "json":
-                config = json.loads(content)
-                if not isinstance(config, dict):
-                    return False
-            elif file_format == "ini":
-                config = self._parse_ini(content)
-            else:
-                return False
-            self.configurations.append(config)
-            return True
+            pending = self._prepare_load(filepath, file_format)
+            return pending is not None and self._finish_load(pending)
         except Exception:
             return False
 
-    def _parse_ini(self, content: str) -> dict:
-        parser = configparser.ConfigParser()
-        parser.read_string(content)
-        result: Dict[str, dict] = {}
-        for section_name in parser.sections():
-            section: Dict[str, Any] = {}
-            for key, value in parser.items(section_name):
-                section[key] = self._parse_ini_value(value)
-            result[section_name] = section
-        return result
+    def load_config_files(
+        self, paths_with_formats: Iterable[Tuple[str, str]], workers: Optional[int] = None,
+    ) -> List[bool]:
+        items = list(paths_with_formats)
+        if not items:
+            return []
+        if workers is None:
+            workers = min(32, (os.cpu_count() or 1) + 4)
+        workers = max(1, min(workers, len(items)))
+        processes = min(workers, os.cpu_count() or 1)
+        # without spare CPUs a process pool only adds pickling: parse large files on the threads
+        inline_limit = _PROCESS_PARSE_BYTES if processes > 1 else None
+
+        pending: List[Any] = []
+        with ThreadPoolExecutor(max_workers=workers) as threads:
+            reads = [threads.submit(self._try_prepare, path, fmt, inline_limit) for path, fmt in items]
+            pool = None
+            try:
+                for future in reads:
+                    item = future.result()
+                    if item is not None and item.tree is _MISSING:
+                        if pool is None:
+                            pool = self._start_pool(processes)
+                        item.tree = self._submit_parse(pool, item)
+                    pending.append(item)
+                for item in pending:
+                    if item is not None and isinstance(item.tree, Future):
+                        item.tree = self._collect_parse(item)
+            finally:
+                if pool:
+                    pool.shutdown()
+        return self._finish_loads(pending)
+
+    async def load_config_file_async(self, filepath: str, file_format: str) -> bool:
+        return (await self.load_config_files_async([(filepath, file_format)]))[0]
+
+    async def load_config_files_async(
+        self, paths_with_formats: Iterable[Tuple[str, str]], concurrency: int = 8,
+    ) -> List[bool]:
+        items = list(paths_with_formats)
+        if not items:
+            return []
+        loop = asyncio.get_running_loop()
+        limit = asyncio.Semaphore(max(1, concurrency))
+        processes = min(max(1, concurrency), len(items), os.cpu_count() or 1)
+        inline_limit = _PROCESS_PARSE_BYTES if processes > 1 else None
+        pool = None
+
+        async def prepare(path: str, fmt: str) -> Optional[_PendingLoad]:
+            nonlocal pool
+            async with limit:
+                item = await loop.run_in_executor(None, self._try_prepare, path, fmt, inline_limit)
+                if item is not None and item.tree is _MISSING:
+                    if pool is None:
+                        pool = self._start_pool(processes)
+                    parsed = self._submit_parse(pool, item)
+                    if isinstance(parsed, Future):
+                        try:
+                            parsed = self._worker_parsed(item, await asyncio.wrap_future(parsed))
+                        except Exception:
+                            parsed = await loop.run_in_executor(None, self._parse_locally, item)
+                    item.tree = parsed
+                return item
+
+        try:
+            pending = await asyncio.gather(*(prepare(path, fmt) for path, fmt in items))
+        finally:
+            if pool:
+                pool.shutdown(wait=False)
+        # one executor job registers everything in input order (cache writes stay off the loop)
+        return await loop.run_in_executor(None, self._finish_loads, pending)
+
+    def _try_prepare(self, filepath: str, file_format: str, inline_limit: Optional[int]) -> Optional[_PendingLoad]:
+        try:
+            return self._prepare_load(filepath, file_format, inline_limit)
+        except Exception:
+            return None
 
-    def _parse_ini_value(self, value: str) -> Any:
-        v = value.strip()
-        low = v.lower()
-        if low in {"true", "yes", "on", "1"}:
-            return True
-        if low in {"false", "no", "off", "0"}:
+    def _start_pool(self, processes: int) -> Union[ProcessPoolExecutor, bool]:
+        try:
+            # reader threads are already running: a forked worker would inherit
+            # their locks mid-read, so workers start from a clean interpreter
+            return ProcessPoolExecutor(max_workers=processes, mp_context=_clean_process_context())
+        except (OSError, NotImplementedError, ImportError, ValueError):
+            # no multiprocessing support here (e.g. missing sem_open): parse inline
             return False
+
+    def _submit_parse(self, pool: Union[ProcessPoolExecutor, bool], item: _PendingLoad) -> Any:
+        if pool:
+            try:
+                return pool.submit(_parse_in_worker, item.raw, item.file_format)
+            except (BrokenProcessPool, RuntimeError):
+                pass
+        return self._parse_locally(item)
+
+    def _collect_parse(self, item: _PendingLoad) -> Optional[dict]:
         try:
-            if any(ch in v for ch in ".eE"):
-                return float(v)
-            return int(v)
-        except ValueError:
-            return v
+            return self._worker_parsed(item, item.tree.result())
+        except Exception:
+            # e.g. a worker was killed, or its result could not be pickled back
+            # (too deeply nested): parse here instead, as the serial loader would
+            return self._parse_locally(item)
 
-    # ---------------- Merging ----------------
+    def _worker_parsed(self, item: _PendingLoad, outcome: Tuple[Optional[dict], float]) -> Optional[dict]:
+        tree, seconds = outcome
+        if self._stats is not None:
+            stage = _PARSE_STAGES.get(item.file_format)
+            if stage is not None:
+                self._stats.record(StageEvent(stage, seconds, keys_visited=_count_keys(tree)))
+        return tree
 
-    def merge_configurations(self) -> dict:
-        if not self.configurations:
-            return {}
-        merged: Dict[str, Any] = {}
-        for cfg in self.configurations:
-            merged = self._deep_merge(merged, cfg)
-        return merged
-
-    def _deep_merge(self, base: dict, overlay: dict) -> dict:
-        out = dict(base)
-        for k, v in overlay.items():
-            if k in out and isinstance(out[k], dict) and isinstance(v, dict):
-                out[k] = self._deep_merge(out[k], v)
+    def _parse_locally(self, item: _PendingLoad) -> Optional[dict]:
+        try:
+            return self._parse_content(_decode(item.raw), item.file_format)
+        except Exception:
+            return None
+
+    def _prepare_load(
+        self, filepath: str, file_format: str, inline_limit: Optional[int] = None,
+    ) -> Optional[_PendingLoad]:
+        # read (or fetch from the cache) and parse, unless the document is larger
+        # than inline_limit: then tree is left as _MISSING for the caller to parse
+        if not os.path.exists(filepath):
+            return None
+        stat = None
+        cached = None
+        if self._cache is not None:
+            stat = os.stat(filepath)
+            cached = self._cache.load(filepath, file_format, stat)
+            if cached is not None and cached[2]:
+                return _PendingLoad(filepath, file_format, stat, None, cached[0], cached[1], True)
+        if self._streams(filepath, file_format):
+            digest = _file_digest(filepath) if cached is not None else None
+            if digest is not None and cached[0] == digest:
+                tree = cached[1]
             else:
-                out[k] = v
-        return out
+                tree, digest = self._stream_json(filepath)
+                if not isinstance(tree, dict):
+                    return None
+            return _PendingLoad(filepath, file_format, stat, None, digest, tree, False)
+        raw = self._read_file(filepath)
+        digest = _content_digest(raw)
+        if cached is not None and cached[0] == digest:
+            tree = cached[1]
+        elif inline_limit is not None and len(raw) > inline_limit:
+            tree = _MISSING
+        else:
+            tree = self._parse_content(_decode(raw), file_format)
+            if tree is None:
+                return None
+        return _PendingLoad(filepath, file_format, stat, raw, digest, tree, False)
+
+    def _finish_loads(self, pending: List[Optional[_PendingLoad]]) -> List[bool]:
+        return [item is not None and item.tree is not None and self._finish_load(item) for item in pending]
+
+    def _finish_load(self, pending: _PendingLoad) -> bool:
+        if self._cache is not None:
+            if pending.cache_hit:
+                self._cache.touch(pending.path, pending.file_format)
+            else:
+                # re-store on a hash hit too, so a same-content touch becomes a trusted hit
+                self._cache.store(pending.path, pending.file_format, pending.stat, pending.digest, pending.tree)
+        self._register(pending.path, pending.file_format, pending.digest, pending.tree)
+        return True
+
+    def _streams(self, filepath: str, file_format: str) -> bool:
+        threshold = self._json_stream_threshold
+        return file_format == "json" and threshold is not None and os.path.getsize(filepath) >= threshold
+
+    def _read_file(self, filepath: str) -> bytes:
+        if self._stats is None:
+            with open(filepath, 'rb') as f:
+                return f.read()
+        start = time.perf_counter()
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        self._stats.record(StageEvent("read", time.perf_counter() - start, bytes_read=len(raw)))
+        return raw
+
+    def _parse_content(self, content: str, file_format: str) -> Optional[dict]:
+        if self._stats is None:
+            return _parse_document(content, file_format)
+        start = time.perf_counter()
+        tree = _parse_document(content, file_format)
+        stage = _PARSE_STAGES.get(file_format)
+        if stage is not None:
+            self._stats.record(StageEvent(stage, time.perf_counter() - start, keys_visited=_count_keys(tree)))
+        return tree
+
+    def _stream_json(self, filepath: str) -> Tuple[Any, str]:
+        # reading and parsing are interleaved: the bytes are booked under parse_json
+        if self._stats is None:
+            return _stream_json(filepath)
+        start = time.perf_counter()
+        tree, digest = _stream_json(filepath)
+        self._stats.record(StageEvent(
+            "parse_json", time.perf_counter() - start,
+            bytes_read=os.path.getsize(filepath), keys_visited=_count_keys(tree),
+        ))
+        return tree, digest
+
+    def _register(self, filepath: str, file_format: str, digest: str, config: dict):
+        self.configurations.append(config)
+        self._sources[id(config)] = _SourceFile(filepath, file_format, digest, config)
+
+    # ---------------- Merging ----------------
+
+    def merge_configurations(self, readonly: bool = False) -> Union[dict, ConfigView]:
+        if self._stats is None:
+            merged = _merge_layers(self.configurations)
+        else:
+            start = time.perf_counter()
+            merged = _merge_layers(self.configurations)
+            self._stats.record(StageEvent(
+                "merge", time.perf_counter() - start, keys_visited=_count_keys(self.configurations),
+            ))
+        return ConfigView(merged) if readonly else merged
 
     # ---------------- Validation ----------------
 
-    def validate_configuration(self, config: dict) -> Tuple[bool, List[str]]:
-        errors: List[str] = []
-        self._validate_dict(config, self.schema, path="", errors=errors)
-        return (len(errors) == 0, errors)
-
-    def _validate_dict(self, data: dict, schema: dict, path: str, errors: List[str]):
-        for field, rule in schema.items():
-            full = f"{path}.{field}" if path else field
-            # required
-            if rule.get("required") and field not in data:
-                errors.append(f"Required field '{full}' is missing")
-                continue
-            if field not in data:
-                continue
-            value = data[field]
-            self._validate_field(value, rule, full, errors)
+    def validate_configuration(
+        self, config: dict, max_errors: Optional[int] = None, structured: bool = False,
+    ) -> Tuple[bool, Union[List[str], List[ValidationIssue]]]:
+        if max_errors is None:
+            errors: List[ValidationIssue] = []
+        elif max_errors < 1:
+            raise ValueError("max_errors must be a positive integer or None")
+        else:
+            errors = _ErrorBudget(max_errors)
+        if self._stats is not None:
+            start = time.perf_counter()
+        try:
+            if self._validator is not None:
+                self._validator(config, errors)
+            else:
+                self._run_plan(config, self._plan, errors)
+        except _ErrorBudgetSpent:
+            pass
+        if self._stats is not None:
+            self._stats.record(StageEvent(
+                "validate", time.perf_counter() - start, keys_visited=_count_keys(config), errors=len(errors),
+            ))
+        if structured:
+            return (len(errors) == 0, list(errors) if max_errors is not None else errors)
+        return (len(errors) == 0, _render(errors))
 
-    def _validate_field(self, value: Any, rule: dict, full: str, errors: List[str]):
-        typ = rule.get("type")
-        # type checking
-        if typ == "string" and not isinstance(value, str):
-            errors.append(f"Field '{full}' must be string, got {type(value).__name__}")
+    def validate_many(
+        self, configs: Iterable[dict], workers: Optional[int] = None, chunk_size: int = 64,
+        max_errors: Optional[int] = None, structured: bool = False,
+    ) -> Iterator[Tuple[int, bool, Union[List[str], List[ValidationIssue]]]]:
+        if workers is None or workers <= 1:
+            for index, config in enumerate(configs):
+                ok, errors = self.validate_configuration(config, max_errors, structured)
+                yield index, ok, errors
             return
-        if typ == "integer" and not isinstance(value, int):
-            errors.append(f"Field '{full}' must be integer, got {type(value).__name__}")
+        pool = self._start_validation_pool(workers)
+        if not pool:
+            yield from self.validate_many(configs, None, chunk_size, max_errors, structured)
             return
-        if typ == "float" and not isinstance(value, (int, float)):
-            errors.append(f"Field '{full}' must be float, got {type(value).__name__}")
-            return
-        if typ == "boolean" and not isinstance(value, bool):
-            errors.append(f"Field '{full}' must be boolean, got {type(value).__name__}")
-            return
-        if typ == "list" and not isinstance(value, list):
-            errors.append(f"Field '{full}' must be list, got {type(value).__name__}")
-            return
-        if typ == "dict" and not isinstance(value, dict):
-            errors.append(f"Field '{full}' must be dict, got {type(value).__name__}")
+        try:
+            # keep a bounded window of chunks in flight so results stream in input order
+            window: List[Future] = []
+            chunks = _chunked(configs, max(1, chunk_size))
+            for start, chunk in chunks:
+                window.append(pool.submit(
+                    _validate_chunk, start, chunk, max_errors, structured, self._stats is not None,
+                ))
+                if len(window) >= workers * 2:
+                    yield from self._chunk_results(window.pop(0))
+            while window:
+                yield from self._chunk_results(window.pop(0))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _chunk_results(self, future: Future) -> List[Tuple[int, bool, Union[List[str], List[ValidationIssue]]]]:
+        results, event = future.result()
+        if event is not None and self._stats is not None:
+            self._stats.record(event)
+        return results
+
+    def _start_validation_pool(self, workers: int) -> Union[ProcessPoolExecutor, bool]:
+        try:
+            # the schema travels once per worker, through the initializer; like
+            # the parse pool, workers never fork a possibly threaded parent
+            return ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=_clean_process_context(),
+                initializer=_init_validation_worker,
+                initargs=(self.schema, self._validator is not None),
+            )
+        except (OSError, NotImplementedError, ImportError, ValueError):
+            return False
+
+    def _run_plan(self, data: dict, plan: Tuple[_FieldPlan, ...], errors: List[ValidationIssue]):
+        # depth-first and pre-order, from an explicit stack of (dict, field
+        # iterator) frames so nesting depth is not bounded by the recursion limit
+        stack = [(data, iter(plan))]
+        while stack:
+            data, fields = stack[-1]
+            for fp in fields:
+                value = data.get(fp.name, _MISSING)
+                if value is _MISSING:
+                    if fp.required:
+                        errors.append(_issue((fp.path, "missing", None, None)))
+                    continue
+                # type checking
+                if fp.types is not None and not isinstance(value, fp.types):
+                    errors.append(_issue((fp.path, "type", value, fp.type_name)))
+                    continue
+                if fp.has_checks:
+                    self._run_checks(fp, value, errors)
+                # nested: finish this dict before the parent's next field
+                if fp.nested is not None and isinstance(value, dict):
+                    stack.append((value, iter(fp.nested)))
+                    break
+            else:
+                stack.pop()
+
+    def _check_field(self, fp: _FieldPlan, value: Any, errors: List[ValidationIssue]):
+        if fp.types is not None and not isinstance(value, fp.types):
+            errors.append(_issue((fp.path, "type", value, fp.type_name)))
             return
+        if fp.has_checks:
+            self._run_checks(fp, value, errors)
+        if fp.nested is not None and isinstance(value, dict):
+            self._run_plan(value, fp.nested, errors)
 
+    def _run_checks(self, fp: _FieldPlan, value: Any, errors: List[ValidationIssue]):
+        full = fp.path
         # numeric ranges
         if isinstance(value, (int, float)):
-            if "min_value" in rule and value < rule["min_value"]:
-                errors.append(f"Field '{full}' value {value} is below minimum {rule['min_value']}")
-            if "max_value" in rule and value > rule["max_value"]:
-                errors.append(f"Field '{full}' value {value} is above maximum {rule['max_value']}")
-
+            bound = fp.min_value
+            if bound is not _MISSING and value < bound:
+                errors.append(_issue((full, "min_value", value, bound)))
+            bound = fp.max_value
+            if bound is not _MISSING and value > bound:
+                errors.append(_issue((full, "max_value", value, bound)))
         # length constraints
-        if isinstance(value, (str, list)):
-            if "min_length" in rule and len(value) < rule["min_length"]:
-                errors.append(f"Field '{full}' length {len(value)} is below minimum {rule['min_length']}")
-            if "max_length" in rule and len(value) > rule["max_length"]:
-                errors.append(f"Field '{full}' length {len(value)} is above maximum {rule['max_length']}")
-
+        elif isinstance(value, (str, list)):
+            bound = fp.min_length
+            if bound is not _MISSING and len(value) < bound:
+                errors.append(_issue((full, "min_length", len(value), bound)))
+            bound = fp.max_length
+            if bound is not _MISSING and len(value) > bound:
+                errors.append(_issue((full, "max_length", len(value), bound)))
         # allowed values
-        if "allowed_values" in rule:
-            if value not in rule["allowed_values"]:
-                errors.append(f"Field '{full}' value '{value}' not in allowed values {rule['allowed_values']}")
-
-        # nested
-        if typ == "dict" and isinstance(value, dict) and "nested_schema" in rule:
-            self._validate_dict(value, rule["nested_schema"], full, errors)
+        allowed = fp.allowed
+        if allowed is not _MISSING:
+            hashed = fp.allowed_hashed
+            if hashed is None:
+                hit = value in allowed
+            else:
+                try:
+                    hit = value in hashed or (fp.allowed_rest and value in fp.allowed_rest)
+                except TypeError:
+                    hit = value in allowed
+            if not hit:
+                errors.append(_issue((full, "allowed_values", value, allowed)))
 
     # ---------------- Transform ----------------
 
-    def transform_values(self, config: dict) -> dict:
+    def transform_values(self, config: dict, lazy: bool = False) -> Union[dict, LazyConfigView]:
+        if lazy:
+            return LazyConfigView(config, self._plan, self._plan_index)
         out: Dict[str, Any] = {}
+        if self._stats is None:
+            self._transform_dict(config, self.schema, out)
+            return out
+        start = time.perf_counter()
         self._transform_dict(config, self.schema, out)
+        self._stats.record(StageEvent("transform", time.perf_counter() - start, keys_visited=_count_keys(config)))
         return out
 
     def _transform_dict(self, data: dict, schema: dict, out: dict):
-        # apply schema-defined fields
-        for field, rule in schema.items():
-            if field in data:
-                out[field] = self._transform_field(data[field], rule)
-            elif "default" in rule:
-                out[field] = rule["default"]
-        # pass-through extra fields
-        for field, value in data.items():
-            if field not in schema:
-                out[field] = value
+        # Nested dicts are queued rather than recursed into: their slot in `out`
+        # is claimed with an empty dict (keeping key order) and filled later.
+        pending = [(data, schema, out)]
+        while pending:
+            data, schema, out = pending.pop()
+            # apply schema-defined fields
+            for field, rule in schema.items():
+                if field in data:
+                    value = data[field]
+                    if rule.get("type") == "dict" and isinstance(value, dict) and "nested_schema" in rule:
+                        nested: Dict[str, Any] = {}
+                        out[field] = nested
+                        pending.append((value, rule["nested_schema"], nested))
+                    else:
+                        out[field] = self._transform_field(value, rule)
+                elif "default" in rule:
+                    out[field] = rule["default"]
+            # pass-through extra fields
+            for field, value in data.items():
+                if field not in schema:
+                    out[field] = value
 
     def _transform_field(self, value: Any, rule: dict) -> Any:
         typ = rule.get("type")
 
-        def to_bool(s: str) -> bool:
-            return s.strip().lower() in {"true", "1", "yes", "on"}
-
         # type coercion
         if typ == "integer":
             try:
@@ -182,7 +2115,7 @@ class ConfigurationProcessor:
                 pass
         elif typ == "boolean":
             if isinstance(value, str):
-                return to_bool(value)
+                return value.strip().lower() in _TRUE_STRINGS
         elif typ == "string":
             if not isinstance(value, str):
                 value = str(value)
@@ -191,7 +2124,7 @@ class ConfigurationProcessor:
         if typ == "dict" and isinstance(value, dict) and "nested_schema" in rule:
             nested: Dict[str, Any] = {}
             self._transform_dict(value, rule["nested_schema"], nested)
-            value = nested
+            return nested
 
         # transforms
         transform = rule.get("transform")
@@ -208,12 +2141,771 @@ class ConfigurationProcessor:
 
         return value
 
+    # ---------------- Incremental Reload ----------------
+
+    def reload(self) -> Tuple[ConfigView, Set[str]]:
+        state = self._incremental
+        changed_files = self._refresh_sources()
+        if self._stats is not None:
+            start = time.perf_counter()
+        if (
+            state is None
+            or len(state.layers) != len(self.configurations)
+            or any(
+                layer is not current and id(layer) not in changed_files
+                for layer, current in zip(state.layers, self.configurations)
+            )
+            or any(() in paths for paths in changed_files.values())
+        ):
+            # first call, layers added/replaced in memory, a top-level reorder,
+            # or the layers a failed reload left behind
+            state, changed = self._rebuild_incremental(state)
+        else:
+            state, changed = self._apply_changes(state, changed_files)
+        errors = [e for fp in self._plan_order for e in state.store.get(fp, ())]
+        if self._stats is not None:
+            # files re-read above are booked under read/parse_*; this is the incremental rebuild
+            self._stats.record(StageEvent("reload", time.perf_counter() - start, errors=len(errors)))
+        if errors:
+            # the last valid state stays current, so the next `changed` is
+            # measured against the config that was actually returned
+            raise ConfigurationError(issues=errors)
+        self._incremental = state
+        # later reloads share untouched subtrees with this result and diff
+        # against it, so callers get it read-only
+        return ConfigView(state.result), changed
+
+    def _refresh_sources(self) -> Dict[int, List[Tuple[Any, ...]]]:
+        # re-read every tracked file; re-parse only those whose content changed
+        updates = []
+        for index, config in enumerate(self.configurations):
+            source = self._sources.get(id(config))
+            if source is None or source.tree is not config:
+                continue
+            try:
+                if self._streams(source.path, source.file_format):
+                    if _file_digest(source.path) == source.digest:
+                        continue
+                    tree, digest = self._stream_json(source.path)
+                    if not isinstance(tree, dict):
+                        tree = None
+                else:
+                    raw = self._read_file(source.path)
+                    digest = _content_digest(raw)
+                    if digest == source.digest:
+                        continue
+                    tree = self._parse_content(_decode(raw), source.file_format)
+            except Exception:
+                tree = None
+            if tree is None:
+                raise ConfigurationError(f"Failed to reload configuration file '{source.path}'")
+            updates.append((index, source, digest, tree))
+        changed_files: Dict[int, List[Tuple[Any, ...]]] = {}
+        for index, source, digest, tree in updates:
+            paths: List[Tuple[Any, ...]] = []
+            _diff_paths(source.tree, tree, (), paths)
+            del self._sources[id(source.tree)]
+            self.configurations[index] = tree
+            self._sources[id(tree)] = _SourceFile(source.path, source.file_format, digest, tree)
+            changed_files[id(source.tree)] = paths
+        return changed_files
+
+    def _rebuild_incremental(self, previous: Optional[_IncrementalState]) -> Tuple[_IncrementalState, Set[str]]:
+        layers = list(self.configurations)
+        merged = _merge_layers(layers)
+        store: Dict[_FieldPlan, List[ValidationIssue]] = {}
+        result = self._build_level(merged, self._plan, self.schema, store)
+        paths: List[Tuple[Any, ...]] = []
+        _diff_paths(previous.merged if previous is not None else {}, merged, (), paths)
+        return _IncrementalState(layers, merged, result, store), {_dotted(path) for path in paths if path}
+
+    def _apply_changes(
+        self, state: _IncrementalState, changed_files: Dict[int, List[Tuple[Any, ...]]],
+    ) -> Tuple[_IncrementalState, Set[str]]:
+        layers = list(self.configurations)
+        old_merged = state.merged
+        merged = old_merged
+        applied: List[Tuple[Any, ...]] = []
+        for path in sorted({p for paths in changed_files.values() for p in paths}, key=len):
+            if any(path[:len(done)] == done for done in applied):
+                continue
+            merged = _remerge(merged, layers, path)
+            applied.append(path)
+        changed = []
+        refresh = []
+        for path in applied:
+            if not _same(_get_in(old_merged, path), _get_in(merged, path)):
+                changed.append(path)
+                refresh.append(path)
+            elif _key_order(_get_in(old_merged, path[:-1])) != _key_order(_get_in(merged, path[:-1])):
+                # same value, but its first appearance moved: extras may need reordering
+                refresh.append(path)
+        # results are copied on write and store lists replaced, never mutated,
+        # so the previous state survives untouched until the caller swaps it
+        state = _IncrementalState(layers, merged, state.result, dict(state.store))
+        for path in refresh:
+            self._refresh_output(state, old_merged, path)
+        return state, {_dotted(path) for path in changed}
+
+    def _refresh_output(self, state: _IncrementalState, old_merged: dict, path: Tuple[Any, ...]):
+        # descend through containers (dict fields with a nested schema that were
+        # and still are dicts), then rebuild only the field the path lands on
+        plans = [self._plan]
+        schemas = [self.schema]
+        indexes = [self._plan_index]
+        merged_nodes = [state.merged]
+        out_nodes = [state.result]
+        containers: List[_FieldPlan] = []
+        old_node = old_merged
+        depth = 0
+        while True:
+            key = path[depth]
+            fp = indexes[-1].get(key)
+            new_value = merged_nodes[-1].get(key, _MISSING)
+            old_value = old_node.get(key, _MISSING) if isinstance(old_node, dict) else _MISSING
+            if (
+                fp is not None and fp.nested is not None and depth + 1 < len(path)
+                and isinstance(new_value, dict) and isinstance(old_value, dict)
+            ):
+                containers.append(fp)
+                plans.append(fp.nested)
+                schemas.append(fp.rule["nested_schema"])
+                indexes.append(fp.index)
+                merged_nodes.append(new_value)
+                out_nodes.append(out_nodes[-1][key])
+                old_node = old_value
+                depth += 1
+                continue
+            break
+        if fp is None:
+            child = merged_nodes[-1].get(key, _MISSING)
+        else:
+            self._clear_store(fp, state.store)
+            child = self._build_field(fp, merged_nodes[-1].get(key, _MISSING), state.store)
+        for level in range(depth, -1, -1):
+            child = self._replace_output(
+                out_nodes[level], path[level], child, plans[level], schemas[level], merged_nodes[level],
+            )
+            if level > 0:
+                container = containers[level - 1]
+                errors: List[ValidationIssue] = []
+                if container.has_checks:
+                    self._run_checks(container, child, errors)
+                self._store_errors(container, errors, state.store)
+        state.result = child
+
+    def _replace_output(
+        self, out: dict, key: Any, value: Any, plan: Tuple[_FieldPlan, ...], schema: dict, merged: dict,
+    ) -> dict:
+        if key in schema and (key in out) == (value is not _MISSING):
+            replaced = dict(out)
+            if value is not _MISSING:
+                replaced[key] = value
+            return replaced
+        # presence changed or an extra moved: rebuild the level in output order
+        # (schema fields, then extras in merged order)
+        replaced = {}
+        for fp in plan:
+            v = value if fp.name == key else out.get(fp.name, _MISSING)
+            if v is not _MISSING:
+                replaced[fp.name] = v
+        for k, v in merged.items():
+            if k not in schema:
+                replaced[k] = v
+        return replaced
+
+    def _build_level(self, data: dict, plan: Tuple[_FieldPlan, ...], schema: dict, store: Dict[_FieldPlan, List[ValidationIssue]]) -> dict:
+        # nested dict fields are built from an explicit stack; their container
+        # checks run once the level below is complete
+        root: Dict[str, Any] = {}
+        stack = [(data, iter(plan), schema, root, None)]
+        while stack:
+            data, fields, schema, out, owner = stack[-1]
+            for fp in fields:
+                value = data.get(fp.name, _MISSING)
+                if fp.nested is not None and isinstance(value, dict):
+                    nested: Dict[str, Any] = {}
+                    out[fp.name] = nested
+                    stack.append((value, iter(fp.nested), fp.rule["nested_schema"], nested, fp))
+                    break
+                value = self._build_field(fp, value, store)
+                if value is not _MISSING:
+                    out[fp.name] = value
+            else:
+                for k, v in data.items():
+                    if k not in schema:
+                        out[k] = v
+                stack.pop()
+                if owner is not None:
+                    errors: List[ValidationIssue] = []
+                    if owner.has_checks:
+                        self._run_checks(owner, out, errors)
+                    self._store_errors(owner, errors, store)
+        return root
+
+    def _build_field(self, fp: _FieldPlan, value: Any, store: Dict[_FieldPlan, List[ValidationIssue]]) -> Any:
+        errors: List[ValidationIssue] = []
+        if value is _MISSING:
+            if "default" in fp.rule:
+                value = fp.rule["default"]
+                self._check_field(fp, value, errors)
+            elif fp.required:
+                errors.append(_issue((fp.path, "missing", None, None)))
+        elif fp.nested is not None and isinstance(value, dict):
+            value = self._build_level(value, fp.nested, fp.rule["nested_schema"], store)
+            if fp.has_checks:
+                self._run_checks(fp, value, errors)
+        else:
+            if fp.convert is not None:
+                value = fp.convert(value)
+            self._check_field(fp, value, errors)
+        self._store_errors(fp, errors, store)
+        return value
+
+    def _store_errors(self, fp: _FieldPlan, errors: List[ValidationIssue], store: Dict[_FieldPlan, List[ValidationIssue]]):
+        if errors:
+            store[fp] = errors
+        else:
+            store.pop(fp, None)
+
+    def _clear_store(self, fp: _FieldPlan, store: Dict[_FieldPlan, List[ValidationIssue]]):
+        stack = [fp]
+        while stack:
+            fp = stack.pop()
+            store.pop(fp, None)
+            if fp.nested is not None:
+                stack.extend(fp.nested)
+
+    # ---------------- Tenant Overlays ----------------
+
+    def process_tenant(self, overlay: dict) -> ConfigView:
+        if not isinstance(overlay, dict):
+            raise TypeError("overlay must be a dict")
+        if self._stats is not None:
+            start = time.perf_counter()
+        base = self._processed_base()
+        # store lists are replaced, never mutated, so a shallow copy isolates tenants
+        store = dict(base.store)
+        result = self._apply_overlay(base, overlay, store)
+        errors = [e for fp in self._plan_order for e in store.get(fp, ())] if store else []
+        if self._stats is not None:
+            elapsed = time.perf_counter() - start
+            self._stats.record(StageEvent("tenant", elapsed, keys_visited=_count_keys(overlay), errors=len(errors)))
+        if errors:
+            raise ConfigurationError(issues=errors)
+        return ConfigView(result)
+
+    def _processed_base(self) -> _IncrementalState:
+        # merged + processed once; rebuilt only when `configurations` holds
+        # different layers (load_config_file, reload() re-parsing a file, ...)
+        base = self._tenant_base
+        if (
+            base is None
+            or len(base.layers) != len(self.configurations)
+            or any(layer is not current for layer, current in zip(base.layers, self.configurations))
+        ):
+            layers = list(self.configurations)
+            merged = _merge_layers(layers)
+            store: Dict[_FieldPlan, List[ValidationIssue]] = {}
+            result = self._build_level(merged, self._plan, self.schema, store)
+            base = self._tenant_base = _IncrementalState(layers, merged, result, store)
+        return base
+
+    def _apply_overlay(self, base: _IncrementalState, overlay: dict, store: Dict[_FieldPlan, List[ValidationIssue]]) -> dict:
+        # Walk the overlay alongside the base's merged tree and output. Only the
+        # output levels the overlay reaches are copied; every other subtree is
+        # the base's own. Deep-merging is associative, so merging the overlay
+        # onto the merged base equals merging it after every base layer.
+        root = dict(base.result)
+        stack = [_OverlayFrame(base.merged, overlay, root, self._plan, self._plan_index, None, None, None)]
+        while stack:
+            frame = stack[-1]
+            merged, out, index = frame.merged, frame.out, frame.index
+            for key, value in frame.items:
+                fp = index.get(key)
+                base_value = merged.get(key, _MISSING)
+                if isinstance(value, dict) and isinstance(base_value, dict):
+                    if fp is not None and fp.nested is not None:
+                        child = dict(out[key])
+                        out[key] = child
+                        stack.append(_OverlayFrame(base_value, value, child, fp.nested, fp.index, fp, out, key))
+                        break
+                    value = _merge_layers([base_value, value])
+                if fp is None:
+                    # pass-through extra: new keys land after the existing ones,
+                    # which is their merged order
+                    out[key] = value
+                    continue
+                if key not in out:
+                    frame.reorder = True
+                self._clear_store(fp, store)
+                out[key] = self._build_field(fp, value, store)
+            else:
+                stack.pop()
+                out = frame.out
+                if frame.reorder:
+                    ordered = {fp.name: out[fp.name] for fp in frame.plan if fp.name in out}
+                    for k, v in out.items():
+                        if k not in frame.index:
+                            ordered[k] = v
+                    out = ordered
+                    if frame.parent is None:
+                        root = out
+                    else:
+                        frame.parent[frame.key] = out
+                owner = frame.owner
+                if owner is not None:
+                    errors: List[ValidationIssue] = []
+                    if owner.has_checks:
+                        self._run_checks(owner, out, errors)
+                    self._store_errors(owner, errors, store)
+        return root
+
+    # ---------------- JSONL Streams ----------------
+
+    def stream_jsonl(self, path: str, output: Optional[str] = None, structured: bool = False) -> JsonlStream:
+        return JsonlStream(self._transform_validate, path, output, structured)
+
+    def _transform_validate(self, config: dict) -> Tuple[dict, List[ValidationIssue]]:
+        # one document has nothing to merge, so the staged pair beats the fused
+        # pass's per-layer frame setup (and picks up the generated validator)
+        result = self.transform_values(config)
+        return result, self.validate_configuration(result, structured=True)[1]
+
+    # ---------------- Binary Snapshots ----------------
+
+    def save_snapshot(self, path: str) -> None:
+        self._write_snapshot(path)
+
+    def _write_snapshot(self, path: str) -> dict:
+        sources = []
+        for config in self.configurations:
+            source = self._sources.get(id(config))
+            if source is None or source.tree is not config:
+                raise ValueError("snapshots need every configuration loaded with load_config_file")
+            # stat before hashing: a write in between leaves a stat that is
+            # never trusted on load, rather than a trusted stat for old content
+            st = os.stat(source.path)
+            if _file_digest(source.path) != source.digest:
+                raise ConfigurationError(f"Configuration file '{source.path}' changed since it was loaded")
+            # absolute, so a worker started from another directory finds the same files
+            absolute = os.path.abspath(source.path)
+            sources.append((absolute, source.file_format, st.st_size, st.st_mtime_ns, source.digest))
+        result, errors = self._process_layers(self.configurations)
+        if errors:
+            raise ConfigurationError(issues=errors)
+        header = (_SNAPSHOT_VERSION, self._fingerprint(), time.time_ns(), tuple(sources))
+        blob = marshal.dumps(header)
+        data = b"".join((_SNAPSHOT_MAGIC, len(blob).to_bytes(4, "little"), blob, marshal.dumps(result)))
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return result
+
+    def load_snapshot(self, path: str, rebuild: bool = False) -> dict:
+        try:
+            header, f = _read_snapshot(path)
+        except (OSError, EOFError, ValueError, TypeError):
+            raise ConfigurationError(f"Invalid configuration snapshot '{path}'") from None
+        _, fingerprint, written_ns, sources = header
+        with f:
+            if fingerprint != self._fingerprint():
+                reason = "schema changed"
+            else:
+                stale = _stale_source(sources, written_ns)
+                if stale is None:
+                    try:
+                        return marshal.loads(f.read())
+                    except (EOFError, ValueError, TypeError):
+                        raise ConfigurationError(f"Invalid configuration snapshot '{path}'") from None
+                reason = f"'{stale}' changed"
+        if not rebuild:
+            raise ConfigurationError(f"Stale configuration snapshot '{path}': {reason}")
+        # reprocess the recorded sources in place of the current configurations;
+        # state derived from the dropped layers goes with them
+        self.configurations = []
+        self._sources.clear()
+        self._incremental = None
+        self._tenant_base = None
+        for source_path, file_format, *_ in sources:
+            if not self.load_config_file(source_path, file_format):
+                raise ConfigurationError(f"Failed to load configuration file '{source_path}'")
+        return self._write_snapshot(path)
+
+    def _fingerprint(self) -> str:
+        if self._schema_fingerprint is None:
+            self._schema_fingerprint = _schema_fingerprint(self.schema)
+        return self._schema_fingerprint
+
     # ---------------- Pipeline ----------------
 
-    def process_all(self) -> dict:
-        merged = self.merge_configurations()
-        transformed = self.transform_values(merged)
-        ok, errors = self.validate_configuration(transformed)
-        if not ok:
-            raise ConfigurationError("Configuration validation failed: " + "; ".join(errors))
-        return transformed
+    def process_all(self, indexed: bool = False) -> Union[dict, ConfigView, IndexedConfig]:
+        if self._results is None:
+            index = _PathIndex() if indexed else None
+            result, errors = self._process_layers(self.configurations, index)
+            if errors:
+                raise ConfigurationError(issues=errors)
+            return IndexedConfig(result, index) if indexed else result
+        result, issues, index = self._cached_process(indexed)
+        if issues:
+            raise ConfigurationError(issues=list(issues))
+        return IndexedConfig(result, index) if indexed else ConfigView(result)
+
+    def _cached_process(
+        self, indexed: bool = False,
+    ) -> Tuple[Optional[dict], Tuple[ValidationIssue, ...], Optional[_PathIndex]]:
+        blobs = _layer_blobs(self.configurations)
+        if blobs is None:
+            layers, key = self.configurations, None
+        else:
+            key = (self._schema_fingerprint,) + tuple(
+                hashlib.blake2b(blob, digest_size=16).digest() for blob in blobs
+            )
+            entry = self._results.get(key)
+            if entry is not None:
+                if indexed and entry[0] is not None and entry[2] is None:
+                    # first indexed request for a result cached without one
+                    index = _PathIndex()
+                    index.add("", entry[0])
+                    entry = (entry[0], entry[1], index)
+                    self._results.put(key, entry)
+                return entry
+            # run on private copies so no cached subtree is shared with a
+            # layer the caller may still mutate
+            layers = [marshal.loads(blob) for blob in blobs]
+        index = _PathIndex() if indexed else None
+        result, errors = self._process_layers(layers, index)
+        entry = (None, tuple(errors), None) if errors else (result, (), index)
+        if key is not None:
+            self._results.put(key, entry)
+        return entry
+
+    def result_cache_info(self) -> Optional[ResultCacheInfo]:
+        return self._results.info() if self._results is not None else None
+
+    def _process_layers(
+        self, layers: List[dict], index: Optional[_PathIndex] = None,
+    ) -> Tuple[dict, List[ValidationIssue]]:
+        errors: List[ValidationIssue] = []
+        if self._stats is None:
+            return self._fuse(layers, self._plan, self.schema, errors, index), errors
+        start = time.perf_counter()
+        result = self._fuse(layers, self._plan, self.schema, errors, index)
+        self._stats.record(StageEvent(
+            "process", time.perf_counter() - start, keys_visited=_count_keys(layers), errors=len(errors),
+        ))
+        return result, errors
+
+    async def process_all_async(self, indexed: bool = False) -> Union[dict, ConfigView, IndexedConfig]:
+        return await asyncio.get_running_loop().run_in_executor(None, self.process_all, indexed)
+
+    def _fuse(
+        self, layers: List[dict], plan: Tuple[_FieldPlan, ...], schema: dict, errors: List[ValidationIssue],
+        index: Optional[_PathIndex] = None,
+    ) -> dict:
+        # merge -> transform -> validate for one level of every layer in a single
+        # pass. Nested levels run from an explicit stack of frames; each collects
+        # its own errors, which follow its owner field's checks once complete.
+        # With an index, every value is recorded under its dotted path as it is
+        # placed in the output.
+        root = _FuseFrame(layers, plan, schema, errors, None, 0)
+        stack = [root]
+        while stack:
+            frame = stack[-1]
+            pending = frame.pending
+            out = frame.out
+            errors = frame.errors
+            for fp in frame.fields:
+                value = pending.get(fp.name, _MISSING)
+                if type(value) is _MergeGroup or isinstance(value, dict):
+                    if fp.nested is not None:
+                        group = value if type(value) is _MergeGroup else (value,)
+                        child = _FuseFrame(
+                            group, fp.nested, fp.rule["nested_schema"], [], fp,
+                            len(index.leaves) if index is not None else 0,
+                        )
+                        out[fp.name] = child.out
+                        stack.append(child)
+                        break
+                    value = _resolve(value)
+                elif value is _MISSING:
+                    if "default" in fp.rule:
+                        value = fp.rule["default"]
+                        out[fp.name] = value
+                        if index is not None:
+                            index.add(fp.path, value)
+                        self._check_field(fp, value, errors)
+                    elif fp.required:
+                        errors.append(_issue((fp.path, "missing", None, None)))
+                    continue
+                if fp.convert is not None:
+                    value = fp.convert(value)
+                out[fp.name] = value
+                if index is not None:
+                    index.add(fp.path, value)
+                if fp.types is not None and not isinstance(value, fp.types):
+                    errors.append(_issue((fp.path, "type", value, fp.type_name)))
+                elif fp.has_checks:
+                    self._run_checks(fp, value, errors)
+            else:
+                # pass-through extra fields
+                schema = frame.schema
+                owner = frame.owner
+                if pending.keys() - schema.keys():
+                    for k, v in pending.items():
+                        if k not in schema:
+                            out[k] = v = _resolve(v)
+                            if index is not None:
+                                index.add(f"{owner.path}.{k}" if owner is not None else f"{k}", v)
+                stack.pop()
+                if index is not None:
+                    index.close(owner.path if owner is not None else "", out, frame.start)
+                if owner is not None:
+                    parent_errors = stack[-1].errors
+                    if owner.has_checks:
+                        self._run_checks(owner, out, parent_errors)
+                    parent_errors.extend(errors)
+        return root.out
+
+    # ---------------- Instrumentation ----------------
+
+    def stats_snapshot(self) -> Optional[ProcessorStats]:
+        return self._stats.snapshot() if self._stats is not None else None
+
+    def reset_stats(self):
+        if self._stats is not None:
+            self._stats.reset()
+
+
+# ---------------- Hot Reload ----------------
+
+class ConfigSnapshot(NamedTuple):
+    generation: int
+    config: ConfigView
+
+
+class ConfigHolder:
+    # Publishes processed configs to concurrent readers. Writers are serialized
+    # and rebuild through the processor's incremental reload, which copies on
+    # write and so never mutates a result it has already returned. The new
+    # snapshot is published by one attribute assignment: readers take no lock
+    # and always see a complete snapshot.
+    def __init__(self, processor: ConfigurationProcessor):
+        self._processor = processor
+        self._lock = threading.Lock()
+        config, _ = processor.reload()
+        self._snapshot = ConfigSnapshot(1, config)
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        return self._snapshot
+
+    def reload(self) -> ConfigSnapshot:
+        with self._lock:
+            # raises before anything is published, so a failed reload leaves
+            # the previous snapshot in place
+            config, _ = self._processor.reload()
+            current = self._snapshot
+            if config._data is current.config._data:
+                return current
+            snapshot = ConfigSnapshot(current.generation + 1, config)
+            self._snapshot = snapshot
+            return snapshot
+
+
+# ---------------- Batch Validation Workers ----------------
+
+_WORKER_PROCESSOR: Optional[ConfigurationProcessor] = None
+
+
+def _init_validation_worker(schema: dict, codegen: bool):
+    global _WORKER_PROCESSOR
+    _WORKER_PROCESSOR = ConfigurationProcessor(schema, codegen=codegen)
+
+
+def _validate_chunk(
+    start: int, configs: List[dict], max_errors: Optional[int], structured: bool, measure: bool,
+) -> Tuple[List[Tuple[int, bool, Union[List[str], List[ValidationIssue]]]], Optional[StageEvent]]:
+    # with measure set, the chunk also reports one aggregated "validate" event
+    validate = _WORKER_PROCESSOR.validate_configuration
+    results = []
+    began = time.perf_counter()
+    for offset, config in enumerate(configs):
+        ok, errors = validate(config, max_errors, structured)
+        results.append((start + offset, ok, errors))
+    if not measure:
+        return results, None
+    event = StageEvent(
+        "validate", time.perf_counter() - began, keys_visited=sum(_count_keys(config) for config in configs),
+        errors=sum(len(errors) for _, _, errors in results), calls=len(configs),
+    )
+    return results, event
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[Tuple[int, List[Any]]]:
+    chunk: List[Any] = []
+    start = 0
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield start, chunk
+            start += size
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+# ---------------- Command Line ----------------
+
+_FORMAT_SUFFIXES = {".json": "json", ".ini": "ini", ".cfg": "ini", ".conf": "ini"}
+
+# exit codes: every group valid / some group failed / bad arguments or inputs
+_EXIT_OK = 0
+_EXIT_FAILED = 1
+_EXIT_USAGE = 2
+
+
+def _read_manifest(path: str) -> List[Tuple[str, List[Tuple[str, str]]]]:
+    # {"group": ["base.json", ["service.conf", "ini"], ...], ...}; relative
+    # paths are resolved against the manifest's directory
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if not isinstance(manifest, dict):
+        raise ValueError("manifest must map group names to lists of files")
+    root = os.path.dirname(os.path.abspath(path))
+    groups = []
+    for name, entries in manifest.items():
+        if not isinstance(entries, list):
+            raise ValueError(f"group '{name}' must list its files")
+        files = []
+        for entry in entries:
+            if isinstance(entry, str):
+                file_format = _FORMAT_SUFFIXES.get(os.path.splitext(entry)[1].lower())
+                if file_format is None:
+                    raise ValueError(f"cannot tell the format of '{entry}' in group '{name}'")
+                entry = [entry, file_format]
+            if not (isinstance(entry, list) and len(entry) == 2 and all(isinstance(x, str) for x in entry)):
+                raise ValueError(f"bad file entry {entry!r} in group '{name}'")
+            files.append((os.path.join(root, entry[0]), entry[1]))
+        groups.append((name, files))
+    return groups
+
+
+def _process_group(
+    new_processor: Callable[[], ConfigurationProcessor], name: str, files: List[Tuple[str, str]], emit_config: bool,
+) -> dict:
+    # a fresh processor per group keeps layers and source tracking apart; the
+    # compiled schema comes from the shared plan cache, so it is built once
+    processor = new_processor()
+    record: Dict[str, Any] = {"group": name, "ok": False, "errors": []}
+    for path, file_format in files:
+        if not processor.load_config_file(path, file_format):
+            record["errors"].append(f"Failed to load configuration file '{path}'")
+    if record["errors"]:
+        return record
+    try:
+        result = processor.process_all()
+    except ConfigurationError as e:
+        record["errors"] = [issue.message for issue in e.issues] if e.issues else [str(e)]
+        return record
+    record["ok"] = True
+    if emit_config:
+        record["config"] = result.to_dict() if isinstance(result, ConfigView) else result
+    return record
+
+
+_WORKER_NEW_PROCESSOR: Optional[Callable[[], ConfigurationProcessor]] = None
+
+
+def _init_group_worker(schema: dict, codegen: bool):
+    global _WORKER_NEW_PROCESSOR
+    _WORKER_NEW_PROCESSOR = partial(ConfigurationProcessor, schema, codegen=codegen)
+
+
+def _process_group_chunk(groups: List[Tuple[str, List[Tuple[str, str]]]], emit_config: bool) -> List[dict]:
+    return [_process_group(_WORKER_NEW_PROCESSOR, name, files, emit_config) for name, files in groups]
+
+
+def _run_groups(
+    schema: dict, groups: List[Tuple[str, List[Tuple[str, str]]]], workers: Optional[int],
+    chunk_size: int, emit_config: bool, codegen: bool,
+) -> Iterator[dict]:
+    # records in manifest order; with workers > 1, chunks of groups run on a
+    # process pool that receives the schema once per worker
+    pool = None
+    if workers is not None and workers > 1:
+        try:
+            pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=_clean_process_context(),
+                initializer=_init_group_worker, initargs=(schema, codegen),
+            )
+        except (OSError, NotImplementedError, ImportError, ValueError):
+            pool = None
+    if pool is None:
+        new_processor = partial(ConfigurationProcessor, schema, codegen=codegen)
+        for name, files in groups:
+            yield _process_group(new_processor, name, files, emit_config)
+        return
+    try:
+        window: List[Future] = []
+        for _, chunk in _chunked(groups, max(1, chunk_size)):
+            window.append(pool.submit(_process_group_chunk, chunk, emit_config))
+            if len(window) >= workers * 2:
+                yield from window.pop(0).result()
+        while window:
+            yield from window.pop(0).result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Process groups of configuration files against one schema, one NDJSON line per group.",
+    )
+    parser.add_argument("--schema", required=True, help="JSON schema definition")
+    parser.add_argument("--manifest", required=True, help='JSON object: {"group": ["file.json", ["file", "ini"]]}')
+    parser.add_argument("--output", help="write NDJSON here instead of stdout")
+    parser.add_argument("--workers", type=int, help="process groups on this many worker processes")
+    parser.add_argument("--chunk-size", type=int, default=16, help="groups per worker task")
+    parser.add_argument("--emit-config", action="store_true", help="include each valid group's processed config")
+    parser.add_argument("--codegen", action="store_true", help="validate with generated code")
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        # argparse exits on --help (0) and on bad arguments (2)
+        return e.code if isinstance(e.code, int) else _EXIT_USAGE
+    try:
+        with open(args.schema, encoding="utf-8") as f:
+            schema = json.load(f)
+        if not isinstance(schema, dict):
+            raise ValueError("schema must be a JSON object")
+        groups = _read_manifest(args.manifest)
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return _EXIT_USAGE
+    failed = 0
+    try:
+        for record in _run_groups(schema, groups, args.workers, args.chunk_size, args.emit_config, args.codegen):
+            failed += not record["ok"]
+            out.write(json.dumps(record, default=str) + "\n")
+    except (OSError, BrokenProcessPool) as e:
+        # output write failed, or the worker pool died mid-run
+        print(f"error: {e}", file=sys.stderr)
+        return _EXIT_USAGE
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        else:
+            out.flush()
+    print(f"{len(groups)} groups, {failed} failed", file=sys.stderr)
+    return _EXIT_FAILED if failed else _EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
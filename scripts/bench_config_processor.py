@@ -0,0 +1,799 @@
+#!/usr/bin/env python3
+#
+# Micro-benchmarks for the Configuration Processor reference solution.
+# Usage:
+#   python scripts/bench_config_processor.py [--solution PATH] [--baseline PATH] [--repeat N] [--only PREFIX]
+#                                            [--json OUT] [--compare RESULTS] [--tolerance FRACTION]
+#
+# --solution defaults to examples/config_processor_completion/04-solution.py.
+# --baseline loads a second solution file (e.g. an older revision exported with
+#   `git show <rev>:examples/config_processor_completion/04-solution.py > /tmp/old.py`)
+#   and prints the speedup of --solution over it.
+# --json writes the results (seconds and peak bytes per case) as JSON.
+# --compare reads a file written by --json and flags every case that got slower,
+#   or grew its peak memory, by more than --tolerance (default 0.25); the exit
+#   status is 1 when any case regressed.
+#
+# The scale/* cases sweep synthetic schemas and overlay files along one axis at
+# a time (width, depth, list size, overlay count, JSON vs INI) and time each
+# pipeline stage separately, e.g. `--only scale/depth` or `--only scale/format`.
+
+import argparse
+import atexit
+import functools
+import importlib.util
+import inspect
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SOLUTION = os.path.join(ROOT, "examples", "config_processor_completion", "04-solution.py")
+
+
+def load_solution(path, name="solution"):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def wide_case(width=2000):
+    schema = {}
+    config = {}
+    for i in range(width):
+        kind = i % 4
+        if kind == 0:
+            schema[f"k{i}"] = {"type": "integer", "min_value": 0, "max_value": 1000}
+            config[f"k{i}"] = i % 1000
+        elif kind == 1:
+            schema[f"k{i}"] = {"type": "string", "min_length": 1, "max_length": 32}
+            config[f"k{i}"] = f"value-{i}"
+        elif kind == 2:
+            schema[f"k{i}"] = {"type": "string", "allowed_values": ["a", "b", "c"]}
+            config[f"k{i}"] = "b"
+        else:
+            schema[f"k{i}"] = {"type": "float", "required": True, "min_value": 0.0}
+            config[f"k{i}"] = float(i)
+    return schema, config
+
+
+def deep_case(depth=40, width=8):
+    schema = {}
+    config = {}
+    for level in range(depth):
+        fields = {f"f{j}": {"type": "integer", "min_value": 0} for j in range(width)}
+        values = {f"f{j}": j for j in range(width)}
+        if schema:
+            fields["child"] = {"type": "dict", "required": True, "nested_schema": schema}
+            values["child"] = config
+        schema, config = fields, values
+    return schema, config
+
+
+def overlay_case(files=8, sections=60, keys=40):
+    schema = {}
+    for i in range(sections):
+        nested = {f"k{j}": {"type": "integer", "min_value": 0, "default": 0} for j in range(keys)}
+        nested["name"] = {"type": "string", "transform": "strip"}
+        schema[f"s{i}"] = {"type": "dict", "nested_schema": nested}
+    configurations = []
+    for f in range(files):
+        layer = {}
+        for i in range(sections):
+            if (i + f) % 2 == 0 or f == 0:
+                layer[f"s{i}"] = {f"k{j}": str(j + f) for j in range(0, keys, f + 1)}
+                layer[f"s{i}"]["name"] = f"  section {i}  "
+        layer[f"extra{f}"] = {"tags": list(range(20))}
+        configurations.append(layer)
+    return schema, configurations
+
+
+def ini_text(sections=100, keys=120):
+    lines = ["# generated"]
+    for i in range(sections):
+        lines.append(f"[section{i}]")
+        for j in range(keys):
+            kind = j % 4
+            value = (j, f"{j}.5", "on", f"  value {j} ")[kind]
+            lines.append(f"Key{j} = {value}" if j % 3 else f"key{j}: {value}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def ini_parse_bench(parser_name, **size):
+    def setup(module, options):
+        text = ini_text(**size)
+        parse = getattr(module, parser_name, None)
+        if parse is None:
+            # older solutions parse INI through the processor (configparser)
+            parse = make_processor(module, {}, options)._parse_ini
+        assert parse(text) is not None
+        return lambda: parse(text)
+    return setup
+
+
+def ini_files_case(files=300, sections=10, keys=20):
+    directory = tempfile.mkdtemp(prefix="bench_cfg_")
+    atexit.register(shutil.rmtree, directory, True)
+    paths = []
+    for f in range(files):
+        lines = []
+        for i in range(sections):
+            lines.append(f"[section{i}]")
+            lines.extend(f"key{j} = {j * f}" if j % 2 else f"key{j} = value {j}" for j in range(keys))
+        path = os.path.join(directory, f"conf{f}.ini")
+        with open(path, "w") as fh:
+            fh.write("\n".join(lines) + "\n")
+        # old mtimes: cached entries for these files are trusted without re-reading
+        os.utime(path, (1_600_000_000, 1_600_000_000))
+        paths.append(path)
+    return directory, paths
+
+
+def load_bench(factory, workers=None):
+    def setup(module, options):
+        directory, paths = factory()
+        options = dict(options)
+        if options.get("cache_dir") is not None:
+            options["cache_dir"] = os.path.join(directory, options["cache_dir"])
+
+        def run():
+            processor = make_processor(module, {}, options)
+            if workers is not None and hasattr(processor, "load_config_files"):
+                assert all(processor.load_config_files([(path, "ini") for path in paths], workers=workers))
+                return
+            for path in paths:
+                assert processor.load_config_file(path, "ini")
+        run()
+        return run
+    return setup
+
+
+def large_json_case(routes=200_000):
+    directory = tempfile.mkdtemp(prefix="bench_cfg_")
+    atexit.register(shutil.rmtree, directory, True)
+    path = os.path.join(directory, "routes.json")
+    document = {
+        "routing": [{"prefix": f"10.{i // 65536}.{i // 256 % 256}.{i % 256}/32", "next_hop": i % 17, "weight": 1.5} for i in range(routes)],
+        "allowlist": [f"feature-{i}" for i in range(routes // 4)],
+    }
+    with open(path, "w") as fh:
+        json.dump(document, fh)
+    return path
+
+
+def large_json_bench(factory):
+    def setup(module, options):
+        path = factory()
+
+        def run():
+            processor = make_processor(module, {}, options)
+            assert processor.load_config_file(path, "json")
+        run()
+        return run
+    return setup
+
+
+def validate_bench(factory):
+    def setup(module, options):
+        schema, config = factory()
+        processor = make_processor(module, schema, options)
+        ok, errors = processor.validate_configuration(config)
+        assert ok, errors[:3]
+        return lambda: processor.validate_configuration(config)
+    return setup
+
+
+def chain_case(depth, width=4, layers=2):
+    # one nested_schema per level: machine-generated, very deep documents
+    schema = {}
+    configurations = [{} for _ in range(layers)]
+    for level in range(depth):
+        fields = {f"f{j}": {"type": "integer", "min_value": 0} for j in range(width)}
+        fields["name"] = {"type": "string", "transform": "strip"}
+        if level:
+            fields["child"] = {"type": "dict", "required": True, "nested_schema": schema}
+        schema = fields
+        for n, previous in enumerate(configurations):
+            values = {f"f{j}": str(j + n) for j in range(n, width, n + 1)}
+            values["name"] = f"  level {level}  "
+            if level:
+                values["child"] = previous
+            configurations[n] = values
+    return schema, configurations
+
+
+def pipeline_bench(stage, factory):
+    def setup(module, options):
+        schema, configurations = factory()
+        processor = make_processor(module, schema, options)
+        processor.configurations = configurations
+        merged = processor.merge_configurations()
+        transformed = processor.transform_values(merged)
+        ok, errors = processor.validate_configuration(transformed)
+        assert ok, errors[:3]
+        if stage == "merge":
+            return processor.merge_configurations
+        if stage == "transform":
+            return lambda: processor.transform_values(merged)
+        if stage == "validate":
+            return lambda: processor.validate_configuration(transformed)
+        processor.process_all()
+        return processor.process_all
+    return setup
+
+
+def enum_case(fields=200, size=20000):
+    # large enumerations (region codes, SKU ids) checked against late members
+    skus = [f"SKU-{i:06d}" for i in range(size)]
+    schema = {f"sku{i}": {"type": "string", "allowed_values": skus} for i in range(fields)}
+    config = {f"sku{i}": skus[-1 - i] for i in range(fields)}
+    return schema, config
+
+
+def invalid_wide_case(width=2000):
+    schema, config = wide_case(width)
+    # every field breaks a rule: types, ranges, lengths and allowed values
+    for i, key in enumerate(config):
+        config[key] = ("-1", -5, "z", -1.0)[i % 4] if i % 8 else None
+    return schema, config
+
+
+def reject_bench(factory, max_errors=None, structured=False):
+    def setup(module, options):
+        schema, config = factory()
+        processor = make_processor(module, schema, options)
+        validate = processor.validate_configuration
+        # older solutions always collect every error and return message strings
+        if structured and accepts(validate, "structured"):
+            return lambda: validate(config, structured=True)
+        if max_errors is not None and accepts(validate, "max_errors"):
+            return lambda: validate(config, max_errors)
+        return lambda: validate(config)
+    return setup
+
+
+def process_all_bench(factory):
+    def setup(module, options):
+        schema, configurations = factory()
+        processor = make_processor(module, schema, options)
+        processor.configurations = configurations
+        processor.process_all()
+        return processor.process_all
+    return setup
+
+
+def merge_bench(factory):
+    def setup(module, options):
+        schema, configurations = factory()
+        processor = make_processor(module, schema, options)
+        processor.configurations = configurations
+        return processor.merge_configurations
+    return setup
+
+
+def leaf_paths(tree, prefix=""):
+    for key, value in tree.items():
+        path = f"{prefix}.{key}" if prefix else f"{key}"
+        if isinstance(value, dict):
+            yield from leaf_paths(value, path)
+        else:
+            yield path
+
+
+def walk_path(tree, path):
+    for key in path.split("."):
+        tree = tree[key]
+    return tree
+
+
+def lookup_bench(factory, indexed):
+    def setup(module, options):
+        schema, configurations = factory()
+        processor = make_processor(module, schema, options)
+        processor.configurations = configurations
+        result = processor.process_all()
+        paths = list(leaf_paths(result))
+        # older solutions have no index: compare against walking the dict
+        if indexed and accepts(processor.process_all, "indexed"):
+            get = processor.process_all(indexed=True).get
+            return lambda: [get(path) for path in paths]
+        return lambda: [walk_path(result, path) for path in paths]
+    return setup
+
+
+def indexed_process_all_bench(factory):
+    def setup(module, options):
+        schema, configurations = factory()
+        processor = make_processor(module, schema, options)
+        processor.configurations = configurations
+        if not accepts(processor.process_all, "indexed"):
+            # older solutions have no index: compare against plain process_all
+            return processor.process_all
+        return lambda: processor.process_all(indexed=True)
+    return setup
+
+
+def transform_bench(factory, lazy, reads=None):
+    # reads=None materializes everything; otherwise reads that many keys
+    def setup(module, options):
+        schema, config = factory()
+        processor = make_processor(module, schema, options)
+        keys = list(processor.transform_values(config))[:reads]
+        # older solutions have no lazy mode: compare against eager
+        if lazy and accepts(processor.transform_values, "lazy"):
+            if reads is None:
+                return lambda: processor.transform_values(config, lazy=True).to_dict()
+
+            def run():
+                view = processor.transform_values(config, lazy=True)
+                return [view[key] for key in keys]
+            return run
+        def run():
+            out = processor.transform_values(config)
+            return [out[key] for key in keys]
+        return run
+    return setup
+
+
+def tenant_overlays(tenants=200):
+    # small per-tenant overlays onto overlay_case's sections
+    return [
+        {f"s{t % 60}": {"k1": str(t), "name": f" tenant {t} "}, "tenant": {"id": t}}
+        for t in range(tenants)
+    ]
+
+
+def tenant_bench(factory, shared):
+    def setup(module, options):
+        schema, configurations = factory()
+        overlays = tenant_overlays()
+        processor = make_processor(module, schema, options)
+        processor.configurations = configurations
+        if shared and hasattr(processor, "process_tenant"):
+            processor.process_tenant(overlays[0])
+            return lambda: [processor.process_tenant(overlay) for overlay in overlays]
+
+        # older solutions: one processor per tenant over base + overlay
+        def run():
+            out = []
+            for overlay in overlays:
+                tenant = make_processor(module, schema, options)
+                tenant.configurations = configurations + [overlay]
+                out.append(tenant.process_all())
+            return out
+        return run
+    return setup
+
+
+def snapshot_files_case(files=8, sections=200, keys=60, settled=True):
+    schema, configurations = overlay_case(files, sections, keys)
+    directory = tempfile.mkdtemp(prefix="bench_cfg_")
+    atexit.register(shutil.rmtree, directory, True)
+    paths = []
+    for f, layer in enumerate(configurations):
+        path = os.path.join(directory, f"layer{f}.json")
+        with open(path, "w") as fh:
+            json.dump(layer, fh)
+        if settled:
+            # old mtimes: the snapshot trusts size + mtime instead of hashing
+            os.utime(path, (1_600_000_000, 1_600_000_000))
+        paths.append(path)
+    return schema, directory, paths
+
+
+def snapshot_bench(factory, from_snapshot):
+    def setup(module, options):
+        schema, directory, paths = factory()
+        snapshot = os.path.join(directory, "config.snap")
+
+        def cold():
+            processor = make_processor(module, schema, options)
+            for path in paths:
+                assert processor.load_config_file(path, "json")
+            return processor.process_all()
+        writer = make_processor(module, schema, options)
+        if not from_snapshot or not hasattr(writer, "save_snapshot"):
+            # older solutions: every worker reprocesses the files
+            cold()
+            return cold
+        for path in paths:
+            assert writer.load_config_file(path, "json")
+        writer.save_snapshot(snapshot)
+        return lambda: make_processor(module, schema, options).load_snapshot(snapshot)
+    return setup
+
+
+def cli_groups_case(groups=500):
+    # a shared base file plus one small override per service
+    schema, (base,) = overlay_case(files=1, sections=20, keys=10)
+    directory = tempfile.mkdtemp(prefix="bench_cfg_")
+    atexit.register(shutil.rmtree, directory, True)
+    with open(os.path.join(directory, "schema.json"), "w") as fh:
+        json.dump(schema, fh)
+    with open(os.path.join(directory, "base.json"), "w") as fh:
+        json.dump(base, fh)
+    manifest = {}
+    for g in range(groups):
+        name = f"svc{g}.ini"
+        with open(os.path.join(directory, name), "w") as fh:
+            fh.write(f"[s{g % 20}]\nk1 = {g}\nname = service {g}\n")
+        manifest[f"svc{g}"] = ["base.json", name]
+    with open(os.path.join(directory, "manifest.json"), "w") as fh:
+        json.dump(manifest, fh)
+    return schema, directory, manifest
+
+
+def cli_bench(factory, workers=None):
+    def setup(module, options):
+        schema, directory, manifest = factory()
+        argv = [
+            "--schema", os.path.join(directory, "schema.json"),
+            "--manifest", os.path.join(directory, "manifest.json"),
+            "--output", os.path.join(directory, "out.ndjson"),
+        ]
+        if workers is not None:
+            argv += ["--workers", str(workers)]
+        if hasattr(module, "main"):
+            return lambda: module.main(argv)
+
+        # older solutions have no CLI: one processor per group, in-process
+        def run():
+            for files in manifest.values():
+                processor = make_processor(module, schema, options)
+                for name in files:
+                    path = os.path.join(directory, name)
+                    assert processor.load_config_file(path, "json" if name.endswith(".json") else "ini")
+                processor.process_all()
+        return run
+    return setup
+
+
+def jsonl_case(documents=20_000):
+    # audit-export shape: one small config document per line, every 50th invalid
+    schema, _ = overlay_case(files=1, sections=6, keys=8)
+    directory = tempfile.mkdtemp(prefix="bench_cfg_")
+    atexit.register(shutil.rmtree, directory, True)
+    path = os.path.join(directory, "export.jsonl")
+    with open(path, "w") as fh:
+        for d in range(documents):
+            doc = {f"s{i}": {f"k{j}": str(d + j) for j in range(0, 8, 2)} for i in range(d % 6 + 1)}
+            if d % 50 == 0:
+                doc["s0"]["k0"] = "-1"
+            fh.write(json.dumps(doc) + "\n")
+    return schema, directory, path
+
+
+def jsonl_bench(factory, write):
+    def setup(module, options):
+        schema, directory, path = factory()
+        output = os.path.join(directory, "out.jsonl") if write else None
+        processor = make_processor(module, schema, options)
+        if hasattr(processor, "stream_jsonl"):
+            return lambda: sum(ok for _, ok, _ in processor.stream_jsonl(path, output))
+
+        # older solutions: read lines, transform and validate each document
+        def run():
+            valid = 0
+            out = open(output, "w") if output else None
+            with open(path) as fh:
+                for line in fh:
+                    config = processor.transform_values(json.loads(line))
+                    ok, _ = processor.validate_configuration(config)
+                    valid += ok
+                    if ok and out:
+                        out.write(json.dumps(config) + "\n")
+            if out:
+                out.close()
+            return valid
+        return run
+    return setup
+
+
+CASES = {
+    "validate/wide": (validate_bench(wide_case), {}),
+    "validate-instrumented/wide": (validate_bench(wide_case), {"instrument": True}),
+    "validate/deep": (validate_bench(deep_case), {}),
+    "validate-codegen/wide": (validate_bench(wide_case), {"codegen": True}),
+    "validate-codegen/deep": (validate_bench(deep_case), {"codegen": True}),
+    "validate/enum-20k": (validate_bench(enum_case), {}),
+    "validate-codegen/enum-20k": (validate_bench(enum_case), {"codegen": True}),
+    "transform/wide-read-5": (transform_bench(wide_case, lazy=False, reads=5), {}),
+    "transform-lazy/wide-read-5": (transform_bench(wide_case, lazy=True, reads=5), {}),
+    "transform/wide": (transform_bench(wide_case, lazy=False), {}),
+    "transform-lazy/wide": (transform_bench(wide_case, lazy=True), {}),
+    "deep-150/merge": (pipeline_bench("merge", lambda: chain_case(150)), {}),
+    "deep-150/transform": (pipeline_bench("transform", lambda: chain_case(150)), {}),
+    "deep-150/validate": (pipeline_bench("validate", lambda: chain_case(150)), {}),
+    "deep-150/process_all": (pipeline_bench("process_all", lambda: chain_case(150)), {}),
+    "deep-1000/merge": (pipeline_bench("merge", lambda: chain_case(1000)), {}),
+    "deep-1000/transform": (pipeline_bench("transform", lambda: chain_case(1000)), {}),
+    "deep-1000/validate": (pipeline_bench("validate", lambda: chain_case(1000)), {}),
+    "deep-1000/process_all": (pipeline_bench("process_all", lambda: chain_case(1000)), {}),
+    "deep-1000-codegen/validate": (pipeline_bench("validate", lambda: chain_case(1000)), {"codegen": True}),
+    "reject/collect-all": (reject_bench(invalid_wide_case), {}),
+    "reject/first-10": (reject_bench(invalid_wide_case, 10), {}),
+    "reject/fail-fast": (reject_bench(invalid_wide_case, 1), {}),
+    "reject-codegen/fail-fast": (reject_bench(invalid_wide_case, 1), {"codegen": True}),
+    "reject-structured/collect-all": (reject_bench(invalid_wide_case, structured=True), {}),
+    "process_all/overlays": (process_all_bench(overlay_case), {}),
+    "process_all-cached/overlays": (process_all_bench(overlay_case), {"result_cache_size": 16}),
+    "process_all-instrumented/overlays": (process_all_bench(overlay_case), {"instrument": True}),
+    "process_all-indexed/overlays": (indexed_process_all_bench(overlay_case), {}),
+    "lookup-walk/deep": (lookup_bench(lambda: chain_case(150), indexed=False), {}),
+    "lookup-indexed/deep": (lookup_bench(lambda: chain_case(150), indexed=True), {}),
+    "tenants-per-processor/200": (tenant_bench(overlay_case, shared=False), {}),
+    "tenants-shared-base/200": (tenant_bench(overlay_case, shared=True), {}),
+    "startup-cold/8x200x60": (snapshot_bench(snapshot_files_case, from_snapshot=False), {}),
+    "startup-snapshot/8x200x60": (snapshot_bench(snapshot_files_case, from_snapshot=True), {}),
+    "startup-snapshot-hashed/8x200x60": (
+        snapshot_bench(lambda: snapshot_files_case(settled=False), from_snapshot=True), {},
+    ),
+    "cli/500-groups": (cli_bench(cli_groups_case), {}),
+    "stream-jsonl/20k-docs": (jsonl_bench(jsonl_case, write=False), {}),
+    "stream-jsonl-write/20k-docs": (jsonl_bench(jsonl_case, write=True), {}),
+    "merge/overlays-40": (merge_bench(lambda: overlay_case(files=40)), {}),
+    "ini-parse/12k-keys": (ini_parse_bench("_parse_ini"), {}),
+    "ini-parse-configparser/12k-keys": (ini_parse_bench("_parse_ini_configparser"), {}),
+    "load/ini-300": (load_bench(ini_files_case), {}),
+    "load-cached/ini-300": (load_bench(ini_files_case), {"cache_dir": "cache"}),
+    "load-parallel/ini-300": (load_bench(ini_files_case, workers=8), {}),
+    "load-json/200k-routes": (large_json_bench(large_json_case), {}),
+    "load-json-stream/200k-routes": (large_json_bench(large_json_case), {"json_stream_threshold": 0}),
+}
+
+
+SCALE_DEFAULTS = {"width": 50, "depth": 3, "list_size": 10, "overlays": 4}
+SCALE_AXES = {
+    "width": (10, 100, 1000),
+    "depth": (1, 4, 16),
+    "list_size": (0, 100, 10_000),
+    "overlays": (1, 8, 32),
+}
+SCALE_FORMATS = ("json", "ini")
+SCALE_STAGES = ("load", "merge", "transform", "validate", "process_all")
+
+
+def scale_level_schema(width, list_size, lists=True):
+    fields = {}
+    for i in range(width):
+        kind = i % 5 if lists else i % 4
+        if kind == 0:
+            fields[f"f{i}"] = {"type": "integer", "min_value": 0, "max_value": 10**9}
+        elif kind == 1:
+            fields[f"f{i}"] = {"type": "string", "transform": "strip", "min_length": 1, "max_length": 64}
+        elif kind == 2:
+            fields[f"f{i}"] = {"type": "float", "min_value": 0.0}
+        elif kind == 3:
+            fields[f"f{i}"] = {"type": "boolean", "default": False}
+        else:
+            fields[f"f{i}"] = {"type": "list", "max_length": list_size}
+    return fields
+
+
+def scale_level_values(width, list_size, overlay, lists=True):
+    # the first file sets every field; overlay n sets every (n+1)-th, mostly as
+    # strings so transform_values has coercions to do
+    values = {}
+    for i in range(0, width, overlay + 1):
+        kind = i % 5 if lists else i % 4
+        values[f"f{i}"] = (
+            str(i + overlay), f"  item {i}  ", f"{i}.5", ("yes", "no")[i % 2], list(range(list_size)),
+        )[kind]
+    return values
+
+
+def scale_nested_case(width, depth, list_size, overlays):
+    schema = None
+    documents = [None] * overlays
+    for _ in range(depth):
+        level = scale_level_schema(width, list_size)
+        if schema is not None:
+            level["child"] = {"type": "dict", "required": True, "nested_schema": schema}
+        schema = level
+        for n in range(overlays):
+            values = scale_level_values(width, list_size, n)
+            if documents[n] is not None:
+                values["child"] = documents[n]
+            documents[n] = values
+    return schema, documents
+
+
+def scale_sections_case(sections=20, width=SCALE_DEFAULTS["width"], overlays=SCALE_DEFAULTS["overlays"]):
+    # two levels of scalars: the shape both JSON and INI can hold
+    schema = {
+        f"section{s}": {"type": "dict", "nested_schema": scale_level_schema(width, 0, lists=False)}
+        for s in range(sections)
+    }
+    documents = [
+        {f"section{s}": scale_level_values(width, 0, n, lists=False) for s in range(sections)}
+        for n in range(overlays)
+    ]
+    return schema, documents
+
+
+def ini_document(document):
+    lines = []
+    for section, values in document.items():
+        lines.append(f"[{section}]")
+        lines.extend(f"{key} = {value}" for key, value in values.items())
+    return "\n".join(lines) + "\n"
+
+
+@functools.lru_cache(maxsize=None)
+def scale_files(fmt, width, depth, list_size, overlays):
+    if depth is None:
+        # format axis: the sectioned shape, written as JSON or INI
+        schema, documents = scale_sections_case(width=width, overlays=overlays)
+    else:
+        schema, documents = scale_nested_case(width, depth, list_size, overlays)
+    directory = tempfile.mkdtemp(prefix="bench_cfg_")
+    atexit.register(shutil.rmtree, directory, True)
+    paths = []
+    for n, document in enumerate(documents):
+        path = os.path.join(directory, f"layer{n}.{fmt}")
+        with open(path, "w") as fh:
+            if fmt == "ini":
+                fh.write(ini_document(document))
+            else:
+                json.dump(document, fh)
+        paths.append(path)
+    return schema, tuple(paths)
+
+
+def scale_bench(stage, fmt="json", width=None, depth=None, list_size=None, overlays=None):
+    def setup(module, options):
+        schema, paths = scale_files(fmt, width, depth, list_size, overlays)
+
+        def load():
+            processor = make_processor(module, schema, options)
+            for path in paths:
+                assert processor.load_config_file(path, fmt), path
+            return processor
+
+        processor = load()
+        if stage == "load":
+            return load
+        merged = processor.merge_configurations()
+        transformed = processor.transform_values(merged)
+        ok, errors = processor.validate_configuration(transformed)
+        assert ok, errors[:3]
+        if stage == "merge":
+            return processor.merge_configurations
+        if stage == "transform":
+            return lambda: processor.transform_values(merged)
+        if stage == "validate":
+            return lambda: processor.validate_configuration(transformed)
+        processor.process_all()
+        return processor.process_all
+    return setup
+
+
+def scale_cases():
+    cases = {}
+    for axis, points in SCALE_AXES.items():
+        for point in points:
+            params = dict(SCALE_DEFAULTS, **{axis: point})
+            for stage in SCALE_STAGES:
+                cases[f"scale/{axis}-{point}/{stage}"] = (scale_bench(stage, **params), {})
+    for fmt in SCALE_FORMATS:
+        params = dict(SCALE_DEFAULTS, depth=None, list_size=0)
+        for stage in SCALE_STAGES:
+            cases[f"scale/format-{fmt}/{stage}"] = (scale_bench(stage, fmt, **params), {})
+    return cases
+
+
+CASES.update(scale_cases())
+
+
+def accepts(func, parameter):
+    # feature probe: older solutions lack newer keyword options
+    params = inspect.signature(func).parameters
+    return parameter in params or any(p.kind is p.VAR_KEYWORD for p in params.values())
+
+
+def make_processor(module, schema, options):
+    # Older solutions without an option: compare against their default path.
+    cls = module.ConfigurationProcessor
+    return cls(schema, **{name: value for name, value in options.items() if accepts(cls, name)})
+
+
+def measure(module, setup, options, repeat):
+    run = setup(module, options)
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+# peak-memory growth below this many bytes is noise, whatever the ratio
+MEMORY_SLACK = 64 * 1024
+
+
+def regressions(stored, seconds, peak, tolerance):
+    flags = []
+    if seconds > stored["seconds"] * (1 + tolerance):
+        flags.append(f"time +{(seconds / stored['seconds'] - 1) * 100:.0f}%")
+    if peak > stored["peak_bytes"] * (1 + tolerance) + MEMORY_SLACK:
+        flags.append(f"memory +{(peak - stored['peak_bytes']) / 1024:.0f} KiB")
+    return flags
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ConfigurationProcessor")
+    parser.add_argument("--solution", default=DEFAULT_SOLUTION)
+    parser.add_argument("--baseline")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", default="", help="run only cases whose name starts with this prefix")
+    parser.add_argument("--json", dest="json_out", help="write machine-readable results to this file")
+    parser.add_argument("--compare", help="results file from --json to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown / memory growth fraction")
+    args = parser.parse_args()
+
+    current = load_solution(args.solution, "solution")
+    baseline = load_solution(args.baseline, "baseline_solution") if args.baseline else None
+    stored = {}
+    if args.compare:
+        with open(args.compare) as fh:
+            stored = json.load(fh)["results"]
+
+    results = {}
+    regressed = []
+    for name, (setup, options) in CASES.items():
+        if not name.startswith(args.only):
+            continue
+        t_cur, m_cur = measure(current, setup, options, args.repeat)
+        results[name] = {"seconds": t_cur, "peak_bytes": m_cur}
+        line = f"{name:<40} {t_cur * 1e6:>12.1f} us {m_cur / 1024:>9.1f} KiB peak"
+        if baseline is not None:
+            try:
+                t_base, m_base = measure(baseline, setup, options, args.repeat)
+            except RecursionError:
+                # older solutions recurse per nesting level
+                results[name]["baseline"] = {"error": "RecursionError"}
+                line += "   baseline RecursionError"
+            else:
+                results[name]["baseline"] = {"seconds": t_base, "peak_bytes": m_base}
+                line += (
+                    f"   baseline {t_base * 1e6:>12.1f} us {m_base / 1024:>9.1f} KiB peak"
+                    f"   speedup {t_base / t_cur:5.2f}x"
+                )
+        if name in stored:
+            flags = regressions(stored[name], t_cur, m_cur, args.tolerance)
+            results[name]["regression"] = flags
+            line += f"   stored {stored[name]['seconds'] * 1e6:>12.1f} us"
+            if flags:
+                regressed.append(name)
+                line += "   REGRESSION (" + ", ".join(flags) + ")"
+        print(line, flush=True)
+
+    if args.json_out:
+        report = {
+            "solution": os.path.abspath(args.solution),
+            "baseline": os.path.abspath(args.baseline) if args.baseline else None,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with open(args.json_out, "w") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+    if args.compare:
+        print(f"{len(regressed)} regression(s) against {args.compare} (tolerance {args.tolerance:.0%})")
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()